@@ -1,5 +1,72 @@
+import math
+import os
 import numpy as np
 import cv2
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+def _compute_estimates(height, width, white_pixels):
+    """
+    Compute the simulated room count, wall length and building area.
+    
+    Args:
+        height: Image height in pixels
+        width: Image width in pixels
+        white_pixels: Number of non-zero pixels in the binary image
+        
+    Returns:
+        Tuple of (room count, wall length in feet, building area in sq ft)
+    """
+    # Calculate the percentage of white pixels
+    white_percentage = white_pixels / (height * width)
+    
+    # Apply a scaling factor to make results more reasonable
+    scaling_factor = 0.3  # Reduce the overall scale
+    
+    # Simulated room count based on image size - more realistic values
+    base_room_count = math.sqrt(white_percentage * height * width) / 70
+    # Cap room count to a reasonable range (3-12 rooms)
+    estimated_rooms = max(3, min(12, int(base_room_count * scaling_factor)))
+    
+    # Simulated wall length based on white pixel count - more realistic values
+    base_wall_length = math.sqrt(white_pixels) * 0.4
+    # Cap wall length to a reasonable range (80-300 feet)
+    estimated_wall_length = max(80, min(300, int(base_wall_length * scaling_factor)))
+    
+    # Simulated building area - more realistic values for residential/small commercial
+    # Most buildings are between 1,000 and 5,000 sq ft
+    base_area = (height * width) * white_percentage * 0.5
+    estimated_building_area = max(1000, min(5000, base_area * scaling_factor))
+    
+    return estimated_rooms, estimated_wall_length, estimated_building_area
+
+def _compute_estimates_batch(heights, widths, white_pixels):
+    """
+    Vectorized version of _compute_estimates over a batch of images.
+    
+    Args:
+        heights: Array of image heights in pixels
+        widths: Array of image widths in pixels
+        white_pixels: Array of non-zero pixel counts in the binary images
+        
+    Returns:
+        Tuple of arrays (room counts, wall lengths in feet, building areas in sq ft)
+    """
+    pixels = np.asarray(heights, dtype=np.float64) * np.asarray(widths, dtype=np.float64)
+    white_pixels = np.asarray(white_pixels, dtype=np.float64)
+    white_percentage = white_pixels / pixels
+    scaling_factor = 0.3
+    
+    base_room_count = np.sqrt(white_percentage * pixels) / 70
+    estimated_rooms = np.clip(np.trunc(base_room_count * scaling_factor), 3, 12).astype(int)
+    
+    base_wall_length = np.sqrt(white_pixels) * 0.4
+    estimated_wall_length = np.clip(np.trunc(base_wall_length * scaling_factor), 80, 300).astype(int)
+    
+    base_area = pixels * white_percentage * 0.5
+    estimated_building_area = np.clip(base_area * scaling_factor, 1000, 5000)
+    
+    return estimated_rooms, estimated_wall_length, estimated_building_area
 
 class BlueprintModel:
     """
@@ -35,28 +102,25 @@ class BlueprintModel:
         height, width = processed_image.shape
         
         # Calculate the number of white pixels (non-zero values in binary image)
-        white_pixels = np.count_nonzero(processed_image)
-        
-        # Calculate the percentage of white pixels
-        white_percentage = white_pixels / (height * width)
-        
-        # Apply a scaling factor to make results more reasonable
-        scaling_factor = 0.3  # Reduce the overall scale
+        white_pixels = cv2.countNonZero(processed_image)
         
-        # Simulated room count based on image size - more realistic values
-        base_room_count = np.sqrt(white_percentage * height * width) / 70
-        # Cap room count to a reasonable range (3-12 rooms)
-        estimated_rooms = max(3, min(12, int(base_room_count * scaling_factor)))
-        
-        # Simulated wall length based on white pixel count - more realistic values
-        base_wall_length = np.sqrt(white_pixels) * 0.4
-        # Cap wall length to a reasonable range (80-300 feet)
-        estimated_wall_length = max(80, min(300, int(base_wall_length * scaling_factor)))
+        return self.predict_from_counts(height, width, white_pixels)
+    
+    def predict_from_counts(self, height, width, white_pixels):
+        """
+        Simulate prediction from image dimensions and white pixel count.
         
-        # Simulated building area - more realistic values for residential/small commercial
-        # Most buildings are between 1,000 and 5,000 sq ft
-        base_area = (height * width) * white_percentage * 0.5
-        estimated_building_area = max(1000, min(5000, base_area * scaling_factor))
+        Args:
+            height: Image height in pixels
+            width: Image width in pixels
+            white_pixels: Number of non-zero pixels in the binary image
+            
+        Returns:
+            Dictionary containing simulated prediction results
+        """
+        estimated_rooms, estimated_wall_length, estimated_building_area = _compute_estimates(
+            height, width, white_pixels
+        )
         
         # Return simulated prediction results with more realistic values
         return {
@@ -65,40 +129,86 @@ class BlueprintModel:
             'building_area_sqft': estimated_building_area,  # More reasonable building area
             'confidence': 0.92  # Simulated confidence score
         }
+    
+    def predict_batch(self, processed_images):
+        """
+        Simulate prediction on several processed blueprint images at once.
+        
+        Args:
+            processed_images: List of 2D numpy arrays of processed images
+            
+        Returns:
+            List of dictionaries containing simulated prediction results
+        """
+        if len(processed_images) == 0:
+            return []
+        
+        # Images may differ in size, so count each one and do the math in bulk
+        heights = np.array([img.shape[0] for img in processed_images])
+        widths = np.array([img.shape[1] for img in processed_images])
+        white_pixels = np.array([cv2.countNonZero(img) for img in processed_images])
+        
+        rooms, wall_lengths, building_areas = _compute_estimates_batch(
+            heights, widths, white_pixels
+        )
+        
+        return [
+            {
+                'room_count': room_count,
+                'wall_length_feet': wall_length,
+                'building_area_sqft': building_area,
+                'confidence': 0.92
+            }
+            for room_count, wall_length, building_area in zip(
+                rooms.tolist(), wall_lengths.tolist(), building_areas.tolist()
+            )
+        ]
 
-def analyze_blueprint(features):
+def _contour_pixel_count(contours, height, width):
     """
-    Analyze blueprint features using the AI model.
+    Count the pixels covered by the contours drawn with a 1-pixel stroke.
     
     Args:
-        features: Dictionary of extracted features from the image
+        contours: List of contours as returned by cv2.findContours
+        height: Image height in pixels
+        width: Image width in pixels
         
     Returns:
-        Dictionary containing analysis results
+        Number of non-zero pixels in the drawn contour image
     """
-    # In a real implementation, we would use the features to make predictions
-    # with our trained model. For demonstration, we'll return simulated results.
+    if len(contours) == 0:
+        return 0
     
-    # Get an instance of our blueprint model
-    model = BlueprintModel()
+    contour_img = np.zeros((height, width), dtype=np.uint8)
+    cv2.drawContours(contour_img, contours, -1, 255, 1)
+    return cv2.countNonZero(contour_img)
+
+# Shared model instance; a real model would load its weights only once
+_MODEL = BlueprintModel()
+
+@lru_cache(maxsize=128)
+def _analyze_counts(height, width, white_pixels, building_area_ratio, detected_windows_doors):
+    """
+    Run the model and derive the analysis from hashable blueprint statistics.
     
-    # Convert the features to a processed image for the model
-    # In this case, just use a dummy image based on the contours
-    if features.get('image_size'):
-        h, w = features['image_size']
-        dummy_image = np.zeros((h, w), dtype=np.uint8)
-        if features.get('contours'):
-            cv2.drawContours(dummy_image, features['contours'], -1, 255, 1)
-    else:
-        # Fallback to a default size if image_size is not available
-        dummy_image = np.zeros((224, 224), dtype=np.uint8)
+    Results are memoized so re-analyzing the same blueprint is a cache hit.
     
+    Args:
+        height: Image height in pixels
+        width: Image width in pixels
+        white_pixels: Number of pixels covered by the blueprint contours
+        building_area_ratio: Building area ratio from the extracted features
+        detected_windows_doors: Windows/doors detected in the image, or None
+        
+    Returns:
+        Dictionary containing analysis results
+    """
     # Get simulated predictions from the model
-    predictions = model.predict(dummy_image)
+    predictions = _MODEL.predict_from_counts(height, width, white_pixels)
     
     # Combine with features to create final analysis 
     # Ensure building_area_ratio is reasonable (60-85%)
-    building_area_ratio = max(0.6, min(0.85, features.get('building_area_ratio', 0.7)))
+    building_area_ratio = max(0.6, min(0.85, building_area_ratio))
     
     # Calculate a reasonable number of windows and doors
     # Most residential rooms have 1-2 windows, plus doors
@@ -106,14 +216,66 @@ def analyze_blueprint(features):
     window_count = room_count * 1.5  # Average 1-2 windows per room
     door_count = room_count + 2  # 1 door per room plus exterior doors
     num_windows_doors = min(int(window_count + door_count), 30)  # Cap to reasonable value
+    if detected_windows_doors is None:
+        detected_windows_doors = num_windows_doors
     
-    analysis = {
+    return {
         'building_area': predictions['building_area_sqft'],
         'num_rooms': room_count,
         'wall_length': predictions['wall_length_feet'],
         'building_area_ratio': building_area_ratio,
-        'num_windows_doors': max(6, min(num_windows_doors, features.get('num_windows_doors', num_windows_doors))),
+        'num_windows_doors': max(6, min(num_windows_doors, detected_windows_doors)),
         'confidence': predictions['confidence']
     }
+
+def analyze_blueprint(features):
+    """
+    Analyze blueprint features using the AI model.
     
-    return analysis
+    Args:
+        features: Dictionary of extracted features from the image
+        
+    Returns:
+        Dictionary containing analysis results
+    """
+    # In a real implementation, we would use the features to make predictions
+    # with our trained model. For demonstration, we'll return simulated results.
+    
+    # Use the pixel count from feature extraction when it is available and
+    # only draw the contours on a dummy image to count them otherwise
+    if features.get('image_size'):
+        h, w = features['image_size']
+        if 'white_pixels' in features:
+            white_pixels = features['white_pixels']
+        else:
+            white_pixels = _contour_pixel_count(features.get('contours') or [], h, w)
+    else:
+        # Fallback to a default size if image_size is not available
+        h, w = 224, 224
+        white_pixels = 0
+    
+    analysis = _analyze_counts(
+        h, w, white_pixels,
+        features.get('building_area_ratio', 0.7),
+        features.get('num_windows_doors')
+    )
+    
+    # Return a copy so callers can't modify the cached result
+    return dict(analysis)
+
+def analyze_blueprints_batch(features_list, max_workers=None, use_processes=False):
+    """
+    Analyze several independent blueprints concurrently.
+    
+    Args:
+        features_list: List of feature dictionaries, one per blueprint
+        max_workers: Number of workers (defaults to the number of CPUs)
+        use_processes: Use a process pool instead of threads for
+            CPU-bound pure-Python work that holds the GIL
+        
+    Returns:
+        List of analysis dictionaries in the same order as features_list
+    """
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(analyze_blueprint, features_list))
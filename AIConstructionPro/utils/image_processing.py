@@ -8,22 +8,22 @@ def preprocess_image(image):
     Preprocess the uploaded blueprint image for analysis.
     
     Args:
-        image: PIL Image object of the blueprint
+        image: PIL Image object or uint8 numpy array of the blueprint
     
     Returns:
         Processed image as numpy array
     """
-    # Convert PIL Image to numpy array
-    img_array = np.array(image)
+    # Convert PIL Image to numpy array; arrays are used as-is without a copy
+    # since every step below writes to a new buffer
+    img_array = np.asarray(image)
     
-    # Convert to grayscale if it's not already
+    # Convert to grayscale if it's not already, then apply Gaussian blur to
+    # reduce noise; the grayscale buffer is our own, so it is blurred in place
     if len(img_array.shape) == 3:
         gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        blurred = cv2.GaussianBlur(gray, (5, 5), 0, dst=gray)
     else:
-        gray = img_array
-    
-    # Apply Gaussian blur to reduce noise
-    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        blurred = cv2.GaussianBlur(img_array, (5, 5), 0)
     
     # Apply adaptive thresholding to get binary image
     thresh = cv2.adaptiveThreshold(
@@ -33,8 +33,10 @@ def preprocess_image(image):
     # Find contours in the binary image
     contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     
-    # Draw contours on a blank image
-    contour_img = np.zeros_like(thresh)
+    # Draw contours on a blank image, reusing the threshold buffer since
+    # findContours no longer needs it
+    contour_img = thresh
+    contour_img.fill(0)
     cv2.drawContours(contour_img, contours, -1, 255, 1)
     
     # Return the processed image
@@ -55,8 +57,10 @@ def extract_features(processed_image):
     
     # Get basic shape features
     total_area = processed_image.shape[0] * processed_image.shape[1]
-    contour_areas = [cv2.contourArea(cnt) for cnt in contours]
-    building_area_ratio = sum(contour_areas) / total_area if total_area > 0 else 0
+    contour_areas = np.fromiter(
+        (cv2.contourArea(cnt) for cnt in contours), dtype=np.float64, count=len(contours)
+    )
+    building_area_ratio = float(contour_areas.sum()) / total_area if total_area > 0 else 0
     
     # Count lines (approximation by detecting straight edges)
     edges = cv2.Canny(processed_image, 50, 150, apertureSize=3)
@@ -66,31 +70,30 @@ def extract_features(processed_image):
     num_lines = 0 if lines is None else len(lines)
     
     # Detect rooms (approximation by detecting closed shapes)
+    # If the shape is relatively large and its approximate polygon has 4 or
+    # more points, consider it a room; only large shapes are approximated
     room_contours = []
-    for cnt in contours:
-        # Get approximate polygon
+    for i in np.flatnonzero(contour_areas > 500):
+        cnt = contours[i]
         epsilon = 0.02 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
-        
-        # If the shape has 4 or more points and is relatively large, consider it a room
-        if len(approx) >= 4 and cv2.contourArea(cnt) > 500:
+        if len(cv2.approxPolyDP(cnt, epsilon, True)) >= 4:
             room_contours.append(cnt)
     
     num_rooms = len(room_contours)
     
     # Count potential windows and doors (approximation)
-    small_rects = []
-    for cnt in contours:
-        x, y, w, h = cv2.boundingRect(cnt)
-        # Small rectangular shapes might be windows or doors
-        if 10 < w < 100 and 10 < h < 100:
-            small_rects.append((x, y, w, h))
+    # Small rectangular shapes might be windows or doors
+    bboxes = np.array([cv2.boundingRect(cnt) for cnt in contours], dtype=np.int32).reshape(-1, 4)
+    widths, heights = bboxes[:, 2], bboxes[:, 3]
+    small_mask = (widths > 10) & (widths < 100) & (heights > 10) & (heights < 100)
+    small_rects = [tuple(rect) for rect in bboxes[small_mask].tolist()]
     
     num_windows_doors = len(small_rects)
     
     # Return extracted features
     return {
         'image_size': processed_image.shape,
+        'white_pixels': cv2.countNonZero(processed_image),
         'building_area_ratio': building_area_ratio,
         'num_contours': len(contours),
         'num_lines': num_lines,
@@ -2,9 +2,11 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.figure_factory as ff
 import plotly.graph_objects as go
+import plotly.io as pio
 import plotly.colors as pc
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from datetime import date, datetime, timedelta
 import os
 import io
@@ -16,7 +18,132 @@ from utils.material_estimation import estimate_materials
 from utils.schedule_generator import generate_schedule
 from ai_models.blueprint_analyzer import analyze_blueprint
 
+# Currency conversion rates (USD to other currencies)
+CURRENCY_RATES = {
+    "USD": 1.0,
+    "INR": 83.5,  # Indian Rupee
+    "EUR": 0.92,  # Euro
+    "GBP": 0.79,  # British Pound
+    "JPY": 151.2, # Japanese Yen
+    "CNY": 7.22,  # Chinese Yuan
+    "AUD": 1.50,  # Australian Dollar
+    "CAD": 1.36,  # Canadian Dollar
+}
+
+CURRENCY_SYMBOLS = {
+    "USD": "$",
+    "INR": "₹",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+    "CNY": "¥",
+    "AUD": "A$",
+    "CAD": "C$",
+}
+
+# Unit conversion options and rates
+UNIT_CONVERSIONS = {
+    "No Conversion": {
+        "cubic yards": (1.0, "cubic yards"),
+        "sq ft": (1.0, "sq ft"),
+        "linear feet": (1.0, "linear feet"),
+        "pieces": (1.0, "pieces"),
+        "tons": (1.0, "tons"),
+        "gallons": (1.0, "gallons")
+    },
+    "Metric": {
+        "cubic yards": (0.764555, "cubic meters"),
+        "sq ft": (0.092903, "sq meters"),
+        "linear feet": (0.3048, "meters"),
+        "pieces": (1.0, "pieces"),
+        "tons": (0.907185, "tonnes"),
+        "gallons": (3.78541, "liters")
+    },
+    "Imperial (UK)": {
+        "cubic yards": (0.764555, "cubic yards"),
+        "sq ft": (0.092903, "sq feet"),
+        "linear feet": (0.3048, "feet"),
+        "pieces": (1.0, "pieces"),
+        "tons": (1.0, "tons"),
+        "gallons": (0.832674, "imp. gallons")
+    }
+}
+
+# The same conversions as aligned (factor, new unit) Series indexed by the
+# original unit, so material tables can be converted with Series.map
+UNIT_CONVERSION_SERIES = {
+    system: (
+        pd.Series({unit: factor for unit, (factor, _) in converters.items()}),
+        pd.Series({unit: new_unit for unit, (_, new_unit) in converters.items()})
+    )
+    for system, converters in UNIT_CONVERSIONS.items()
+}
+
+# Plotly config for summary charts that need no hover, zoom or mode bar
+STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Example images shown on request, as (url, caption) in display order
+EXAMPLE_BLUEPRINTS = (
+    ("https://images.unsplash.com/photo-1503387837-b154d5074bd2", "Construction Blueprint Example 1"),
+    ("https://images.unsplash.com/photo-1627660080110-20045fd3875d", "Construction Blueprint Example 2"),
+    ("https://images.unsplash.com/photo-1503387762-592deb58ef4e", "Construction Blueprint Example 3"),
+    ("https://images.unsplash.com/photo-1542621334-a254cf47733d", "Construction Blueprint Example 4"),
+)
+EXAMPLE_MATERIALS = (
+    ("https://images.unsplash.com/photo-1627882206813-8c1ffd86efec", "Building Materials Example 1"),
+    ("https://images.unsplash.com/photo-1609867271967-a82f85c48531", "Building Materials Example 2"),
+    ("https://images.unsplash.com/photo-1595414440701-da000c40df9c", "Building Materials Example 3"),
+    ("https://images.unsplash.com/photo-1504307651254-35680f356dfd", "Building Materials Example 4"),
+)
+EXAMPLE_CONSTRUCTION_SITES = (
+    ("https://images.unsplash.com/photo-1504917595217-d4dc5ebe6122", "Construction Site Example 1"),
+    ("https://images.unsplash.com/photo-1541888946425-d81bb19240f5", "Construction Site Example 2"),
+    ("https://images.unsplash.com/photo-1489514354504-1653aa90e34e", "Construction Site Example 3"),
+    ("https://images.unsplash.com/photo-1429497419816-9ca5cfb4571a", "Construction Site Example 4"),
+)
+EXAMPLE_SCHEDULE_CHARTS = (
+    ("https://images.unsplash.com/photo-1541888946425-d81bb19240f5", "Schedule Chart Example 1"),
+    ("https://images.unsplash.com/photo-1489514354504-1653aa90e34e", "Schedule Chart Example 2"),
+    ("https://images.unsplash.com/photo-1429497419816-9ca5cfb4571a", "Schedule Chart Example 3"),
+    ("https://images.unsplash.com/photo-1531834685032-c34bf0d84c77", "Schedule Chart Example 4"),
+)
+
+def show_example_images(examples):
+    """
+    Show example images in a two-column grid.
+    
+    The images are passed to the browser by URL, so the server does not
+    download them.
+    
+    Args:
+        examples: Sequence of (url, caption) pairs in display order
+    """
+    columns = st.columns(2)
+    for i, (url, caption) in enumerate(examples):
+        with columns[i % 2]:
+            st.image(url, caption=caption, width="stretch")
+
 # Helper function for consistent date handling throughout the application
+@lru_cache(maxsize=4096)
+def _parse_date(date_str):
+    """
+    Parse a YYYY-MM-DD string, caching the result since tasks share dates.
+    
+    Args:
+        date_str: Date string in YYYY-MM-DD format
+        
+    Returns:
+        A date object
+    """
+    return datetime.strptime(date_str, '%Y-%m-%d').date()
+
+# Converters keyed by exact type so the common cases skip isinstance/hasattr
+_DATE_CONVERTERS = {
+    str: _parse_date,
+    datetime: datetime.date,
+    date: None  # Already a date, returned as is
+}
+
 def get_date(date_obj):
     """
     Convert various date formats to a consistent date object.
@@ -28,15 +155,1245 @@ def get_date(date_obj):
     Returns:
         A date object (not datetime)
     """
-    # If it's a string, convert to datetime then date
+    date_type = type(date_obj)
+    if date_type in _DATE_CONVERTERS:
+        converter = _DATE_CONVERTERS[date_type]
+        return date_obj if converter is None else converter(date_obj)
+    # Subclasses (e.g. pandas Timestamp) fall back to the general checks
     if isinstance(date_obj, str):
-        return datetime.strptime(date_obj, '%Y-%m-%d').date()
-    # If it's a datetime, convert to date
+        return _parse_date(date_obj)
     elif hasattr(date_obj, 'date'):
         return date_obj.date()
-    # If it's already a date, return as is
     return date_obj
 
+def completion_from_dates(schedule, today):
+    """
+    Calculate date-based completion percentages for all tasks at once.
+    
+    Args:
+        schedule: List of task dictionaries with start_date and end_date
+        today: The date to measure progress against
+        
+    Returns:
+        NumPy array of integer completion percentages (0-100), one per task
+    """
+    dates = pd.DataFrame(schedule, columns=['start_date', 'end_date'])
+    starts = pd.to_datetime(dates['start_date']).to_numpy().astype('datetime64[D]')
+    ends = pd.to_datetime(dates['end_date']).to_numpy().astype('datetime64[D]')
+    
+    # Tasks not yet started clip to 0 and finished tasks clip to 100
+    duration = np.maximum(1, (ends - starts).astype(np.int64))
+    days_passed = (np.datetime64(today, 'D') - starts).astype(np.int64)
+    return np.clip(days_passed * 100 // duration, 0, 100)
+
+def task_completion(starts, ends, today, manual_completion=None):
+    """
+    Calculate the completion percentage of every task at once.
+    
+    Args:
+        starts: datetime64[D] array of task start dates
+        ends: datetime64[D] array of task end dates
+        today: The date to measure progress against
+        manual_completion: Optional float array of manual percentages, NaN
+            where a task has none; these take precedence over the dates
+    
+    Returns:
+        Float array of completion percentages (0-100), one per task
+    """
+    durations = (ends - starts).astype(np.int64)
+    days_passed = (np.datetime64(today, 'D') - starts).astype(np.int64)
+    progress = np.trunc(days_passed / np.maximum(durations, 1) * 100)
+    
+    # Tasks not yet started are at 0%, finished and zero-length tasks at 100%
+    completion = np.where(
+        days_passed < 0,
+        0.0,
+        np.where((days_passed > durations) | (durations <= 0), 100.0, np.clip(progress, 0, 100))
+    )
+    if manual_completion is not None:
+        completion = np.where(np.isnan(manual_completion), completion, manual_completion)
+    return completion
+
+def weighted_phase_completion(phase_codes, completion, durations, n_phases):
+    """
+    Average task completion per phase, weighting each task by its duration.
+    
+    Args:
+        phase_codes: Integer array giving each task's phase index
+        completion: Array of task completion percentages
+        durations: Array of task durations in days
+        n_phases: Number of phases
+    
+    Returns:
+        Float array of completion percentages, one per phase
+    """
+    totals = np.bincount(phase_codes, weights=durations, minlength=n_phases)
+    sums = np.bincount(phase_codes, weights=completion * durations, minlength=n_phases)
+    
+    # Phases without any duration count as complete
+    return np.divide(sums, totals, out=np.full(n_phases, 100.0), where=totals > 0)
+
+def group_tasks_by_phase(schedule):
+    """
+    Group schedule tasks by phase in a single pass.
+    
+    Args:
+        schedule: List of task dictionaries
+        
+    Returns:
+        Dictionary mapping each phase (in sorted order) to a list of
+        (task index, task) pairs in schedule order
+    """
+    phase_index = {}
+    for i, task in enumerate(schedule):
+        phase_index.setdefault(task['phase'], []).append((i, task))
+    return {phase: phase_index[phase] for phase in sorted(phase_index)}
+
+@dataclass(frozen=True, slots=True)
+class ProjectInfo:
+    """
+    Immutable snapshot of the project information, used as a cache key.
+    
+    The sidebar keeps editing the project_info dictionary in session state;
+    this snapshot gives the cached pipeline a small, stable value to hash.
+    """
+    name: str
+    location: str
+    start_date: date
+    contractor: str
+    area_sqft: int
+    
+    @classmethod
+    def from_dict(cls, project_info):
+        """
+        Create a snapshot from the project information dictionary.
+        
+        Args:
+            project_info: Dictionary with project information
+            
+        Returns:
+            ProjectInfo instance
+        """
+        return cls(
+            name=project_info['name'],
+            location=project_info['location'],
+            start_date=get_date(project_info['start_date']),
+            contractor=project_info['contractor'],
+            area_sqft=project_info['area_sqft']
+        )
+    
+    def to_dict(self):
+        """
+        Convert the snapshot back to the dictionary the utilities expect.
+        
+        Returns:
+            Dictionary with project information
+        """
+        return asdict(self)
+
+def convert_materials(materials, conversion_rate, unit_factors, unit_names):
+    """
+    Convert material costs and units in a single vectorized pass.
+    
+    Args:
+        materials: DataFrame of material estimates from estimate_materials
+        conversion_rate: Multiplier from USD to the selected currency
+        unit_factors: Series of conversion factors indexed by original unit
+        unit_names: Series of converted unit names indexed by original unit
+        
+    Returns:
+        DataFrame of converted materials
+    """
+    df = materials.copy()
+    
+    # Apply currency conversion to cost
+    df['cost'] = df['cost'] * conversion_rate
+    
+    # Apply currency conversion to cost_per_unit, or derive it from the converted cost
+    if 'cost_per_unit' in df:
+        df['cost_per_unit'] = df['cost_per_unit'] * conversion_rate
+    else:
+        quantity = df['quantity'].where(df['quantity'] > 0)
+        df['cost_per_unit'] = (df['cost'] / quantity).fillna(0)
+    
+    # Apply unit conversion and adjust cost per unit based on the new unit
+    factors = df['unit'].map(unit_factors)
+    new_units = df['unit'].map(unit_names)
+    df['quantity'] = df['quantity'] * factors.fillna(1.0)
+    df['unit'] = new_units.fillna(df['unit'])
+    df['cost_per_unit'] = df['cost_per_unit'] / factors.where(factors > 0).fillna(1.0)
+    
+    return df
+
+def cost_column_config(currency_symbol):
+    """
+    Build st.dataframe column settings that show material costs in a currency.
+    
+    The numbers are formatted by the browser, so the tables need no
+    preformatted string columns.
+    
+    Args:
+        currency_symbol: Symbol shown in front of the costs
+    
+    Returns:
+        Dictionary of column configurations for the cost columns
+    """
+    cost_format = f"{currency_symbol}%,.2f"
+    return {
+        'cost': st.column_config.NumberColumn(format=cost_format),
+        'cost_per_unit': st.column_config.NumberColumn(format=cost_format)
+    }
+
+# Shared look for the material category bar charts, layered on the default theme.
+# The background stays on each figure because Streamlit merges its own theme
+# into the template layout and would replace a template-level plot_bgcolor.
+pio.templates['ecopilot_bar'] = go.layout.Template(
+    layout=dict(
+        showlegend=False  # Remove legend
+    ),
+    data=dict(
+        # Simplify bar appearance
+        bar=[go.Bar(marker_line_width=1, marker_line_color="white", opacity=0.8)]
+    )
+)
+
+@st.cache_data(show_spinner=False)
+def build_category_bar(records, title, color):
+    """
+    Build the bar chart of material quantities for one category.
+    
+    Args:
+        records: Tuple of (material name, quantity) pairs
+        title: Chart title
+        color: Bar color as a hex string
+        
+    Returns:
+        Plotly figure with the category bar chart
+    """
+    df = pd.DataFrame(list(records), columns=['name', 'quantity'])
+    fig = px.bar(
+        df, 
+        x='name', 
+        y='quantity', 
+        title=title,
+        color_discrete_sequence=[color],  # Single color per category
+        template=f"{pio.templates.default}+ecopilot_bar"
+    )
+    fig.update_layout(
+        xaxis_title="Material Name", 
+        yaxis_title="Quantity",
+        plot_bgcolor='white'  # Clean white background
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_phase_completion_bar(records):
+    """
+    Build the bar chart of average completion per construction phase.
+    
+    Args:
+        records: Tuple of (phase, average completion, number of tasks) triples
+        
+    Returns:
+        Plotly figure with the phase completion bar chart
+    """
+    summary_df = pd.DataFrame(list(records), columns=['Phase', 'Average Completion', 'Number of Tasks'])
+    fig = px.bar(
+        summary_df,
+        x='Phase',
+        y='Average Completion',
+        title='Average Completion Percentage by Phase',
+        text='Average Completion',
+        color='Average Completion',
+        color_continuous_scale=[(0, "red"), (0.5, "yellow"), (1, "green")],
+        range_color=[0, 100],
+        hover_data=['Number of Tasks']
+    )
+    
+    fig.update_traces(
+        texttemplate='%{text:.1f}%',
+        textposition='outside',
+        marker_line_width=1.5,
+        marker_line_color='white'
+    )
+    
+    fig.update_layout(
+        yaxis_range=[0, 105],  # Set y-axis range from 0 to 105 to make room for labels
+        yaxis_title='Completion Percentage',
+        xaxis_title='Construction Phase',
+        coloraxis_showscale=False,
+        height=300
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_completion_heatmap(records):
+    """
+    Build the heatmap of task completion by construction phase.
+    
+    Args:
+        records: Tuple of (phase, task name, completion) triples
+        
+    Returns:
+        Plotly figure with the task completion heatmap
+    """
+    task_df = pd.DataFrame(list(records), columns=['Phase', 'Task', 'Completion'])
+    fig = px.density_heatmap(
+        task_df,
+        x='Phase',
+        y='Task',
+        z='Completion',
+        title='Task Completion Heatmap',
+        color_continuous_scale=[(0, "red"), (0.5, "yellow"), (1, "green")],
+        range_color=[0, 100]
+    )
+    
+    fig.update_layout(
+        xaxis_title='Construction Phase',
+        yaxis_title='Task',
+        coloraxis_colorbar=dict(title='Completion %'),
+        height=400
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_timeline_gantt(records, today):
+    """
+    Build the 2D Gantt timeline of the filtered tasks.
+    
+    Args:
+        records: Tuple of (task name, start date, finish date, phase) per task,
+            with dates as YYYY-MM-DD strings
+        today: The date to mark on the timeline
+        
+    Returns:
+        Plotly figure with the 2D timeline
+    """
+    # Create a simplified 2D timeline
+    timeline_df = pd.DataFrame(list(records), columns=['Task', 'Start', 'Finish', 'Phase'])
+    fig2d = px.timeline(
+        timeline_df, 
+        x_start='Start', 
+        x_end='Finish', 
+        y='Task', 
+        color='Phase',
+        color_discrete_sequence=px.colors.qualitative.Bold
+    )
+    
+    # Add today marker using a shape instead of vline to avoid type error
+    fig2d.add_shape(
+        type="line",
+        x0=today,
+        x1=today,
+        y0=0,
+        y1=1,
+        yref="paper",
+        line=dict(
+            color="green",
+            width=2,
+            dash="dash",
+        )
+    )
+    
+    # Add Today label
+    fig2d.add_annotation(
+        x=today,
+        y=1.05,
+        yref="paper",
+        text="Today",
+        showarrow=False,
+        font=dict(
+            color="green",
+            size=12,
+            family="Arial, sans-serif"
+        )
+    )
+    
+    # Simplify layout
+    fig2d.update_layout(
+        height=400,
+        xaxis_title="Timeline",
+        yaxis_title="Tasks",
+        legend_title="Construction Phases",
+        font=dict(family='Arial', size=12),
+        uniformtext_minsize=10,
+        uniformtext_mode='hide',
+        plot_bgcolor='rgba(240, 240, 240, 0.8)',  # Light gray background
+        # Keep the user's zoom and legend toggles when filters change the data
+        uirevision='timeline-2d'
+    )
+    
+    # Make the chart more readable
+    fig2d.update_traces(
+        marker_line_width=2,
+        marker_line_color="white",
+        opacity=0.8
+    )
+    return fig2d
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def summarize_schedule(task_rows, today, using_manual_completion):
+    """
+    Summarize task and phase completion for the schedule dashboard.
+    
+    Args:
+        task_rows: Tuple of (start date, end date, phase, manual completion
+            or None) per task, in schedule order
+        today: The date to measure progress against
+        using_manual_completion: Whether manual completion values take precedence
+    
+    Returns:
+        Tuple of (overall completion percentage, (completed, in progress,
+        upcoming) task counts, phase completion DataFrame, task count per
+        phase DataFrame, phase timeline DataFrame)
+    """
+    starts = np.array([row[0] for row in task_rows], dtype='datetime64[D]')
+    ends = np.array([row[1] for row in task_rows], dtype='datetime64[D]')
+    durations = (ends - starts).astype(np.int64)
+    task_phases = [row[2] for row in task_rows]
+    manual_completion = np.array(
+        [np.nan if row[3] is None else row[3] for row in task_rows], dtype=float
+    ) if using_manual_completion else None
+    
+    # Extract the phases once; every per-phase rollup below indexes them
+    # by their integer phase code
+    phase_names, first_seen, phase_codes = np.unique(task_phases, return_index=True, return_inverse=True)
+    
+    # Per-task completion, rolled up per phase by duration
+    completions = task_completion(starts, ends, today, manual_completion)
+    phase_completions = weighted_phase_completion(phase_codes, completions, durations, len(phase_names))
+    
+    # Overall project completion, weighting each task by its duration
+    total_duration_days = durations.sum()
+    if total_duration_days > 0:
+        overall_completion = float((completions * (durations / total_duration_days)).sum())
+    else:
+        overall_completion = 0
+    
+    # Task status counts: with manual values a task is completed at 100% and
+    # in progress at any other positive value; otherwise the dates decide
+    if using_manual_completion:
+        completed_tasks = int((manual_completion == 100).sum())
+        in_progress_tasks = int(((manual_completion > 0) & (manual_completion != 100)).sum())
+        future_tasks = len(task_rows) - completed_tasks - in_progress_tasks
+    else:
+        today_day = np.datetime64(today, 'D')
+        completed_tasks = int((ends < today_day).sum())
+        in_progress_tasks = int(((starts <= today_day) & (today_day <= ends)).sum())
+        future_tasks = int((starts > today_day).sum())
+    task_counts = (completed_tasks, in_progress_tasks, future_tasks)
+    
+    phase_completion_df = pd.DataFrame({
+        'Phase': phase_names,
+        'Completion': phase_completions.round(1)
+    })
+    
+    # Task counts per phase, in the order the phases first appear
+    appearance_order = np.argsort(first_seen)
+    phase_df = pd.DataFrame({
+        'Phase': phase_names[appearance_order].tolist(),
+        'Number of Tasks': np.bincount(phase_codes, minlength=len(phase_names))[appearance_order]
+    })
+    
+    # Timeline summary by phase: the span of each phase's tasks, reduced
+    # over the tasks sorted by phase
+    by_phase = np.argsort(phase_codes, kind='stable')
+    phase_bounds = np.searchsorted(phase_codes[by_phase], np.arange(len(phase_names)))
+    earliest_starts = np.minimum.reduceat(starts[by_phase], phase_bounds)
+    latest_ends = np.maximum.reduceat(ends[by_phase], phase_bounds)
+    
+    if using_manual_completion:
+        # With manual completion values, use the duration-weighted average
+        # of the phase's tasks
+        timeline_completions = phase_completions.astype(int)
+    else:
+        # Traditional calculation based on today's date and the phase span
+        timeline_completions = task_completion(earliest_starts, latest_ends, today).astype(int)
+    
+    timeline_df = pd.DataFrame({
+        'Phase': phase_names.tolist(),
+        'Start Date': earliest_starts.tolist(),
+        'End Date': latest_ends.tolist(),
+        'Duration (days)': (latest_ends - earliest_starts).astype(np.int64),
+        'Completion': timeline_completions
+    })
+    return overall_completion, task_counts, phase_completion_df, phase_df, timeline_df
+
+@st.cache_data(show_spinner=False)
+def build_phase_progress_bar(phase_completion_df):
+    """
+    Build the bar chart of duration-weighted completion per construction phase.
+    
+    Args:
+        phase_completion_df: DataFrame with Phase and Completion columns
+    
+    Returns:
+        Plotly figure with the phase completion bar chart
+    """
+    fig = px.bar(
+        phase_completion_df,
+        x='Phase',
+        y='Completion',
+        title='Completion Percentage by Construction Phase',
+        text='Completion',
+        color='Completion',
+        color_continuous_scale=[(0, "red"), (0.5, "yellow"), (1, "green")],
+        range_color=[0, 100]
+    )
+    
+    fig.update_traces(
+        texttemplate='%{text:.1f}%',
+        textposition='outside',
+        marker_line_width=1.5,
+        marker_line_color='white'
+    )
+    
+    fig.update_layout(
+        yaxis_range=[0, 105],  # Set y-axis range from 0 to 105 to make room for labels
+        yaxis_title='Completion Percentage',
+        xaxis_title='Construction Phase',
+        coloraxis_showscale=False,
+        font=dict(family="Arial", size=12),
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_phase_count_bar(phase_df):
+    """
+    Build the bar chart of the number of tasks per construction phase.
+    
+    Args:
+        phase_df: DataFrame with Phase and Number of Tasks columns
+    
+    Returns:
+        Plotly figure with the task distribution bar chart
+    """
+    # Simplified tasks by phase bar chart
+    fig = px.bar(
+        phase_df, 
+        x='Phase', 
+        y='Number of Tasks', 
+        title='Tasks Distribution by Construction Phase',
+        text='Number of Tasks',
+        color_discrete_sequence=['#636efa']  # Single blue color
+    )
+    
+    fig.update_layout(
+        xaxis_title="Construction Phase",
+        yaxis_title="Number of Tasks",
+        font=dict(family="Arial", size=14),
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=14,
+            font_family="Arial"
+        )
+    )
+    
+    # Add value labels on top of bars
+    fig.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        marker_line_color='rgb(8,48,107)',
+        marker_line_width=1.5
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_phase_timeline_bar(timeline_df):
+    """
+    Build the horizontal bar chart of phase durations with their completion.
+    
+    Args:
+        timeline_df: DataFrame with Phase, Start Date, End Date,
+            Duration (days) and Completion columns, one row per phase
+    
+    Returns:
+        Plotly figure with the phase timeline chart
+    """
+    # Simplified project timeline progress chart
+    fig = px.bar(
+        timeline_df, 
+        y='Phase', 
+        x='Duration (days)', 
+        color_discrete_sequence=['#5388D8'],  # Single uniform color
+        labels={'Duration (days)': 'Duration (days)', 'Phase': 'Construction Phase'},
+        title='Construction Phases Timeline',
+        text='Completion',  # Keep completion as text inside bars
+        hover_data=['Start Date', 'End Date', 'Duration (days)']
+    )
+    
+    fig.update_layout(
+        height=500,
+        yaxis={'categoryorder':'array', 'categoryarray': timeline_df['Phase'].tolist()[::-1]},
+        font=dict(family="Arial", size=14),
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=14,
+            font_family="Arial"
+        ),
+        # Add a vertical line for today's date
+        shapes=[dict(
+            type='line',
+            x0=0,
+            x1=max(timeline_df['Duration (days)']),
+            y0=-0.5,
+            y1=len(timeline_df) - 0.5,
+            yref='y',
+            line=dict(color='rgba(0,0,0,0.3)', width=2, dash='dot')
+        )]
+    )
+    
+    # Add value labels showing completion percentage
+    fig.update_traces(
+        texttemplate='%{text}%',
+        textposition='inside',
+        insidetextanchor='middle',
+        marker_line_color='rgb(8,48,107)',
+        marker_line_width=1.5
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def _open_image(img_bytes):
+    """
+    Decode an uploaded image once and keep it in memory across reruns.
+    
+    Args:
+        img_bytes: Raw bytes of the uploaded file
+        
+    Returns:
+        Decoded PIL Image (shared, so callers must not modify it in place)
+    """
+    image = Image.open(io.BytesIO(img_bytes))
+    image.load()
+    return image
+
+def _excel_value(value):
+    """
+    Convert a DataFrame value to something openpyxl can write.
+    
+    Args:
+        value: A single cell value
+        
+    Returns:
+        The value as a plain Python object, None for missing values
+    """
+    # Containers such as predecessor lists are written as text, like pandas does
+    if isinstance(value, (list, tuple, dict, set)):
+        return str(value)
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def write_excel_report(sheets):
+    """
+    Write DataFrames to an Excel workbook in openpyxl's write-only mode.
+    
+    Rows are streamed to the output instead of building the full in-memory
+    cell grid that pandas.ExcelWriter uses.
+    
+    Args:
+        sheets: Dictionary mapping sheet names to DataFrames
+        
+    Returns:
+        The workbook as bytes
+    """
+    # openpyxl is only needed once an Excel report is downloaded, so it is
+    # imported here to keep it out of every session's startup
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    
+    for sheet_name, df in sheets.items():
+        worksheet = workbook.create_sheet(sheet_name)
+        
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(worksheet, value=str(column))
+            cell.font = header_font
+            header.append(cell)
+        worksheet.append(header)
+        
+        for row in df.itertuples(index=False, name=None):
+            worksheet.append([_excel_value(value) for value in row])
+    
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+def csv_bytes(df):
+    """
+    Write a DataFrame straight to UTF-8 encoded CSV bytes for a download.
+    
+    Args:
+        df: DataFrame to export
+    
+    Returns:
+        The CSV file as bytes, without the index column
+    """
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def build_export_files(materials, schedule, project_info, export_currency, export_units, export_date):
+    """
+    Build the summary report and the export tables for the selected settings.
+    
+    Only the summary is rendered up front; the CSV and Excel files are written
+    from the returned tables when the user clicks their download button.
+    
+    Args:
+        materials: DataFrame of material estimates from estimate_materials
+        schedule: List of task dictionaries from generate_schedule
+        project_info: ProjectInfo snapshot of the project information
+        export_currency: Currency code to convert costs to
+        export_units: Name of the unit system to convert quantities to
+        export_date: Datetime the exports are stamped with
+    
+    Returns:
+        Tuple of (summary Markdown, dictionary mapping Excel sheet names to
+        DataFrames)
+    """
+    export_symbol = CURRENCY_SYMBOLS[export_currency]
+    export_unit_factors, export_unit_names = UNIT_CONVERSION_SERIES[export_units]
+    
+    # Convert all materials based on selected currency and units in one
+    # vectorized pass, shared with the materials tab
+    materials_df = convert_materials(
+        materials,
+        CURRENCY_RATES[export_currency],
+        export_unit_factors,
+        export_unit_names
+    )
+    
+    # The exported files carry the costs formatted in the export currency too
+    materials_df['display_cost'] = export_symbol + materials_df['cost'].map('{:,.2f}'.format)
+    materials_df['display_cost_per_unit'] = export_symbol + materials_df['cost_per_unit'].map('{:,.2f}'.format)
+    
+    schedule_df = pd.DataFrame(schedule)
+    
+    # Helper function to format dates for summary
+    def format_date(date_obj):
+        if hasattr(date_obj, 'date'):
+            return date_obj.date().strftime("%Y-%m-%d")
+        return date_obj.strftime("%Y-%m-%d")
+    
+    # Find earliest start and latest end from the schedule columns, at day
+    # precision like get_date
+    earliest_start = pd.to_datetime(schedule_df['start_date']).min().normalize()
+    latest_end = pd.to_datetime(schedule_df['end_date']).max().normalize()
+    
+    # Calculate duration
+    project_duration = (latest_end - earliest_start).days
+    
+    # Calculate total cost in selected currency
+    total_cost = materials_df['cost'].sum()
+    
+    # Convert area to selected unit system if needed
+    area_value = project_info.area_sqft
+    area_unit = "sq ft"
+    
+    if export_units == "Metric":
+        area_value = area_value * 0.092903
+        area_unit = "sq meters"
+    elif export_units == "Imperial (UK)":
+        area_unit = "sq feet"
+    
+    # Generate project summary with converted values; the report keeps its
+    # original indentation, which st.markdown strips when displaying it
+    summary = f"""
+        # Project Summary Report
+        
+        ## Project Information
+        - **Project Name:** {project_info.name}
+        - **Location:** {project_info.location}
+        - **Start Date:** {project_info.start_date}
+        - **Contractor:** {project_info.contractor}
+        - **Total Area:** {area_value:,.2f} {area_unit}
+        
+        ## Material Estimation Summary
+        - **Total Material Cost:** {export_symbol}{total_cost:,.2f}
+        - **Number of Material Types:** {len(materials)}
+        - **Currency:** {export_currency}
+        - **Unit System:** {export_units}
+        
+        ## Schedule Summary
+        - **Project Start Date:** {format_date(earliest_start)}
+        - **Project End Date:** {format_date(latest_end)}
+        - **Project Duration:** {project_duration} days
+        - **Number of Tasks:** {len(schedule)}
+        
+        ## Top 5 Most Expensive Materials
+        """
+    
+    # Add top materials with converted values; nlargest picks them without
+    # sorting every row and keeps the first of materials with equal costs
+    sorted_materials = materials_df.nlargest(5, 'cost')
+    for i, (name, cost, quantity, unit) in enumerate(
+        zip(sorted_materials['name'], sorted_materials['cost'], sorted_materials['quantity'], sorted_materials['unit']), 1
+    ):
+        summary += f"{i}. **{name}**: {export_symbol}{cost:,.2f} ({quantity:,.2f} {unit})\n"
+    
+    # Collect the Excel sheets; the materials and schedule sheets double as
+    # the CSV exports
+    # Add project info as a separate sheet
+    project_info_df = pd.DataFrame([{
+        "Project Name": project_info.name,
+        "Location": project_info.location,
+        "Start Date": project_info.start_date,
+        "Contractor": project_info.contractor,
+        "Area": f"{area_value:,.2f} {area_unit}",
+        "Total Cost": f"{export_symbol}{total_cost:,.2f}",
+        "Currency": export_currency,
+        "Units": export_units,
+        "Project Duration": f"{project_duration} days",
+        "Generated On": export_date.strftime("%Y-%m-%d %H:%M:%S")
+    }])
+    return summary, {
+        "Materials": materials_df,
+        "Schedule": schedule_df,
+        "Project Info": project_info_df
+    }
+
+# Longest side, in pixels, that uploaded blueprints are analyzed at
+MAX_PROCESSING_SIDE = 1600
+
+# Cached wrappers for the blueprint pipeline, keyed by the uploaded image bytes
+# so reprocessing the same blueprint skips the computer vision work
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _cached_preprocess(img_bytes):
+    image = Image.open(io.BytesIO(img_bytes))
+    # Cap the pixel count; downstream processing scales with image area
+    if max(image.size) > MAX_PROCESSING_SIDE:
+        image.thumbnail((MAX_PROCESSING_SIDE, MAX_PROCESSING_SIDE), Image.Resampling.BOX)
+    return preprocess_image(image)
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _cached_features(img_bytes):
+    return extract_features(_cached_preprocess(img_bytes))
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _cached_analyze(img_bytes):
+    return analyze_blueprint(_cached_features(img_bytes))
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _cached_materials(analysis, project_info):
+    return estimate_materials(analysis, project_info.to_dict())
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _cached_schedule(analysis, project_info, as_of):
+    # Task statuses depend on today's date, so it is part of the cache key
+    return generate_schedule(analysis, project_info.to_dict())
+
+# Most tasks per phase drawn in the 3D timeline, for performance
+MAX_3D_TASKS_PER_PHASE = 25
+
+# Triangles (as vertex indices i, j, k) covering the six faces of a box whose
+# eight corners are listed bottom face first, then top face, counter-clockwise
+BOX_TRIANGLES_I = np.array([0, 0, 4, 4, 0, 0, 3, 3, 0, 0, 1, 1])
+BOX_TRIANGLES_J = np.array([1, 2, 5, 6, 1, 5, 2, 6, 3, 7, 2, 6])
+BOX_TRIANGLES_K = np.array([2, 3, 6, 7, 5, 4, 6, 7, 7, 4, 6, 5])
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def build_threed_data(schedule_rows, phases, today, using_manual_completion):
+    """
+    Build the per-task coordinates and colors for the 3D timeline.
+    
+    Args:
+        schedule_rows: Tuple of (task name, phase, responsible party, start date,
+            end date, critical path flag, manual completion or None) per task
+        phases: Sorted tuple of the phases to lay out along the y axis
+        today: The date to measure progress against
+        using_manual_completion: Whether manual completion values take precedence
+        
+    Returns:
+        Tuple of (3D task records, project start, project end, project duration
+        in days, list of (phase, task count) for phases capped for performance)
+    """
+    threed_data = []
+    capped_phases = []
+    
+    # Per-task columns for the whole schedule, filled in one pass each
+    n_rows = len(schedule_rows)
+    phase_codes = {phase: phase_idx for phase_idx, phase in enumerate(phases)}
+    row_phases = np.fromiter((phase_codes[row[1]] for row in schedule_rows), dtype=np.int64, count=n_rows)
+    row_starts = np.fromiter((row[3].toordinal() for row in schedule_rows), dtype=np.int64, count=n_rows)
+    row_ends = np.fromiter((row[4].toordinal() for row in schedule_rows), dtype=np.int64, count=n_rows)
+    
+    # Calculate the project timeline parameters once
+    project_start = date.fromordinal(int(row_starts.min()))
+    project_end = date.fromordinal(int(row_ends.max()))
+    project_duration = max(1, (project_end - project_start).days)
+    
+    # Pick the tasks to draw, in phase order
+    selected_parts = []
+    for phase_idx, phase in enumerate(phases):
+        # Get and sort tasks for this phase
+        phase_rows = np.flatnonzero(row_phases == phase_idx)
+        phase_rows = phase_rows[np.argsort(row_starts[phase_rows], kind='stable')]
+        
+        # Process only a limited number of tasks if there are too many
+        if len(phase_rows) > MAX_3D_TASKS_PER_PHASE:
+            capped_phases.append((phase, len(phase_rows)))
+            # Choose tasks distributed evenly across the timeline, from the first
+            # task through the last
+            phase_rows = phase_rows[np.linspace(0, len(phase_rows) - 1, MAX_3D_TASKS_PER_PHASE, dtype=int)]
+        
+        selected_parts.append(phase_rows)
+    selected = np.concatenate(selected_parts)
+    
+    # Day offsets for all selected tasks at once
+    tasks = [schedule_rows[i] for i in selected.tolist()]
+    starts = row_starts[selected]
+    durations = row_ends[selected] - starts
+    days_passed = today.toordinal() - starts
+    
+    # Calculate completion based on dates: 0 before the start, 100 once the
+    # duration has passed, otherwise the truncated share of elapsed days
+    in_progress = (days_passed >= 0) & (days_passed < durations)
+    progress = np.divide(days_passed, durations, out=np.zeros(len(tasks)), where=in_progress)
+    date_completion = np.where(
+        days_passed >= durations, 100, np.trunc(progress * 100).astype(np.int64)
+    ).tolist()
+    
+    # Use manual completion percentage if available
+    completions = [
+        task[6] if using_manual_completion and task[6] is not None else date_completion[i]
+        for i, task in enumerate(tasks)
+    ]
+    completion_values = np.array(completions, dtype=float)
+    critical_mask = np.array([bool(task[5]) for task in tasks])
+    
+    # Simplified color calculation: red to green for critical path tasks,
+    # blue-based for regular tasks
+    red = np.where(critical_mask, 255 - (2.55 * completion_values).astype(np.int64),
+                   50 + completion_values.astype(np.int64))
+    green = np.where(critical_mask, (2.55 * completion_values).astype(np.int64),
+                     100 + (1.5 * completion_values).astype(np.int64))
+    blue = np.where(critical_mask, 0, 200 + (0.55 * completion_values).astype(np.int64))
+    colors = [f'rgb({r},{g},{b})' for r, g, b in zip(red.tolist(), green.tolist(), blue.tolist())]
+    
+    # Normalized positions along the project timeline
+    x_positions = ((starts - project_start.toordinal()) / project_duration).tolist()
+    widths = np.maximum(0.02, durations / project_duration)
+    
+    # Add to the 3D dataset with simplified calculations
+    for task, phase_idx, duration, x, width, z, completion, color in zip(
+        tasks, row_phases[selected].tolist(), durations.tolist(), x_positions,
+        widths.tolist(), (widths / 2).tolist(), completions, colors
+    ):
+        task_name, phase, resource, start, end, critical, _ = task
+        threed_data.append({
+            'task': task_name,
+            'phase': phase,
+            'resource': resource,
+            'start': start.strftime('%Y-%m-%d'),
+            'end': end.strftime('%Y-%m-%d'),
+            'duration': duration,
+            'x': x,
+            'y': phase_idx,
+            'z': z,  # Center point
+            'width': width,  # Duration
+            'height': 1.5 if critical else 1.0,
+            'completion': completion,
+            'color': color,
+            'critical': critical
+        })
+    
+    return threed_data, project_start, project_end, project_duration, capped_phases
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def build_timeline_guides(project_start, project_end, phases):
+    """
+    Build the static guide traces of the 3D timeline.
+    
+    Args:
+        project_start: First task start date
+        project_end: Last task end date
+        phases: Tuple of the phases laid out along the y axis
+        
+    Returns:
+        Tuple of Plotly traces: the ground plane, the phase labels, the date
+        labels and the dashed date marker lines
+    """
+    # Add a ground plane for better depth perception; it is flat and a single
+    # color, so its four corners are enough
+    x_min, x_max = 0, 1
+    y_min, y_max = 0, len(phases)
+    grid_x, grid_y = np.meshgrid(np.linspace(x_min, x_max, 2), np.linspace(y_min, y_max, 2))
+    grid_z = np.zeros_like(grid_x)
+    
+    ground = go.Surface(
+        x=grid_x,
+        y=grid_y,
+        z=grid_z,
+        colorscale=[[0, 'rgba(230, 230, 230, 0.5)'], [1, 'rgba(200, 200, 200, 0.5)']],
+        showscale=False,
+        hoverinfo='skip'
+    )
+    
+    # Add phase labels on Y-axis
+    phase_labels = go.Scatter3d(
+        x=[0] * len(phases),
+        y=[i + 0.5 for i in range(len(phases))],
+        z=[0] * len(phases),
+        mode='text',
+        text=list(phases),
+        textposition="middle left",
+        textfont=dict(
+            color='black',
+            size=14,
+            family='Arial, sans-serif'
+        ),
+        showlegend=False
+    )
+    
+    # Add timeline markers on X-axis (convert normalized positions back to dates)
+    project_duration_days = (project_end - project_start).days
+    positions = [i / 10 for i in range(0, 11)]  # 0 to 10 points
+    date_labels = [
+        (project_start + timedelta(days=int(position * project_duration_days))).strftime("%Y-%m-%d")
+        for position in positions
+    ]
+    
+    date_label_trace = go.Scatter3d(
+        x=positions,
+        y=[-0.5] * len(positions),  # Just below the grid
+        z=[0] * len(positions),
+        mode='text',
+        text=date_labels,
+        textposition="middle center",
+        textfont=dict(
+            color='black',
+            size=10,
+            family='Arial, sans-serif'
+        ),
+        showlegend=False
+    )
+    
+    # Add vertical lines for date markers as one trace, with None breaking
+    # the line between markers
+    marker_x, marker_y, marker_z = [], [], []
+    for position in positions:
+        marker_x += [position, position, None]
+        marker_y += [0, len(phases), None]
+        marker_z += [0, 0, None]
+    
+    date_lines = go.Scatter3d(
+        x=marker_x,
+        y=marker_y,
+        z=marker_z,
+        mode='lines',
+        line=dict(
+            color='rgba(150, 150, 150, 0.3)',
+            width=2,
+            dash='dash'
+        ),
+        showlegend=False
+    )
+    
+    return ground, phase_labels, date_label_trace, date_lines
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def build_threed_figure(schedule_rows, phases, today, using_manual_completion):
+    """
+    Build the 3D construction timeline figure.
+    
+    Args:
+        schedule_rows: Tuple of task rows, as taken by build_threed_data
+        phases: Sorted tuple of the phases to lay out along the y axis
+        today: The date to measure progress against and mark on the timeline
+        using_manual_completion: Whether manual completion values take precedence
+        
+    Returns:
+        Plotly figure with the 3D timeline
+    """
+    threed_data, project_start, project_end, _, _ = build_threed_data(
+        schedule_rows, phases, today, using_manual_completion
+    )
+    
+    # Create 3D bar chart
+    fig = go.Figure()
+    
+    # Corners of every task box: x spans the task dates, y the phase
+    # row and z the task importance (critical tasks stand taller)
+    n_tasks = len(threed_data)
+    x0 = np.array([task['x'] for task in threed_data])
+    widths = np.array([task['width'] for task in threed_data])
+    x1 = x0 + widths
+    y0 = np.array([task['y'] for task in threed_data], dtype=float)
+    heights = np.array([task['height'] for task in threed_data])
+    y1 = y0 + heights
+    box_x = np.column_stack([x0, x1, x1, x0, x0, x1, x1, x0]).ravel()
+    box_y = np.column_stack([y0, y0, y1, y1, y0, y0, y1, y1]).ravel()
+    box_z = np.column_stack([np.zeros(n_tasks)] * 4 + [heights] * 4).ravel()
+    
+    # Offset the shared box triangles to each task's block of 8 vertices
+    vertex_offsets = (np.arange(n_tasks) * 8)[:, None]
+    
+    # One f-string per task, so each hover label is a single allocation
+    hovertexts = [
+        f"<b>{task['task']}</b><br>"
+        f"Phase: {task['phase']}<br>"
+        f"Resource: {task['resource']}<br>"
+        f"Start: {task['start']}<br>"
+        f"End: {task['end']}<br>"
+        f"Duration: {task['duration']} days<br>"
+        f"Completion: {task['completion']}%<br>"
+        f"Critical Path: {'Yes' if task['critical'] else 'No'}"
+        for task in threed_data
+    ]
+    
+    # Draw all task boxes as one mesh instead of several traces per task
+    fig.add_trace(go.Mesh3d(
+        x=box_x,
+        y=box_y,
+        z=box_z,
+        i=(BOX_TRIANGLES_I + vertex_offsets).ravel(),
+        j=(BOX_TRIANGLES_J + vertex_offsets).ravel(),
+        k=(BOX_TRIANGLES_K + vertex_offsets).ravel(),
+        vertexcolor=np.repeat([task['color'] for task in threed_data], 8),
+        flatshading=True,
+        hoverinfo='text',
+        hovertext=np.repeat(hovertexts, 8),
+        name='Tasks',
+        showlegend=False
+    ))
+    
+    # Add text labels for all task names in a single trace
+    fig.add_trace(go.Scatter3d(
+        x=x0 + widths / 2,
+        y=y0 + heights / 2,
+        z=heights + 0.05,
+        mode='text',
+        text=[f"{task['task']}<br>{task['completion']}%" for task in threed_data],
+        hoverinfo='skip',
+        textfont=dict(
+            color='black',
+            size=12
+        ),
+        showlegend=False
+    ))
+    
+    # Add the ground plane, phase labels and date markers, which
+    # only depend on the project dates and phases
+    fig.add_traces(build_timeline_guides(project_start, project_end, phases))
+    project_duration_days = (project_end - project_start).days
+    
+    # Add today marker
+    today_normalized = (today - project_start).days / max(1, project_duration_days)
+    if 0 <= today_normalized <= 1:  # Check if today is within project timeframe
+        fig.add_trace(go.Scatter3d(
+            x=[today_normalized, today_normalized],
+            y=[0, len(phases)],
+            z=[0, 3],  # Make it tall enough to be visible
+            mode='lines',
+            line=dict(
+                color='rgba(0, 200, 0, 0.8)',
+                width=5
+            ),
+            name="Today",
+            showlegend=True
+        ))
+        
+        fig.add_trace(go.Scatter3d(
+            x=[today_normalized],
+            y=[len(phases) + 0.5],
+            z=[1.5],
+            mode='text',
+            text="TODAY",
+            textposition="top center",
+            textfont=dict(
+                color='green',
+                size=16,
+                family='Arial Black, Arial Bold, Arial'
+            ),
+            showlegend=False
+        ))
+    
+    # Add critical path indicator for legend
+    fig.add_trace(go.Scatter3d(
+        x=[None], y=[None], z=[None],
+        mode='markers',
+        marker=dict(size=10, color='red'),
+        name='Critical Path Tasks',
+        showlegend=True
+    ))
+    
+    # Add regular task indicator for legend
+    fig.add_trace(go.Scatter3d(
+        x=[None], y=[None], z=[None],
+        mode='markers',
+        marker=dict(size=10, color='rgb(0, 180, 230)'),
+        name='Regular Tasks',
+        showlegend=True
+    ))
+    
+    # Layout configuration
+    camera = dict(
+        eye=dict(x=1.5, y=-1.5, z=1.25),
+        up=dict(x=0, y=0, z=1)
+    )
+    
+    fig.update_layout(
+        title={
+            'text': '3D Construction Project Timeline',
+            'font': {'size': 28, 'color': '#333', 'family': 'Arial Black, Arial Bold, Arial'},
+            'x': 0.5,
+            'y': 0.95,
+            'xanchor': 'center'
+        },
+        width=1000,
+        height=800,
+        scene=dict(
+            xaxis=dict(
+                title='Project Timeline',
+                showbackground=False,
+                showgrid=False,
+                showticklabels=False,
+                zeroline=False
+            ),
+            yaxis=dict(
+                title='Construction Phases',
+                showbackground=False,
+                showgrid=False,
+                showticklabels=False,
+                zeroline=False
+            ),
+            zaxis=dict(
+                title='Task Importance',
+                showbackground=False,
+                showgrid=False,
+                showticklabels=False,
+                zeroline=False
+            ),
+            aspectratio=dict(x=1.5, y=1, z=0.5),
+            camera=camera
+        ),
+        paper_bgcolor='rgba(250, 250, 250, 0.9)',
+        legend=dict(
+            font=dict(size=14),
+            itemsizing='constant',
+            bgcolor='rgba(255, 255, 255, 0.8)',
+            bordercolor='rgba(0, 0, 0, 0.2)',
+            borderwidth=1
+        ),
+        margin=dict(l=0, r=0, t=50, b=0),
+        # Keep the user's camera when filters change the data
+        uirevision='timeline-3d'
+    )
+    return fig
+
 # Set page configuration
 st.set_page_config(
     page_title="Construction Analyzer",
@@ -104,46 +1461,36 @@ with tab1:
     if show_examples:
         st.subheader("Example Blueprints")
         
-        with st.spinner("Loading example images..."):
-            col1, col2 = st.columns(2)
-            with col1:
-                st.image("https://images.unsplash.com/photo-1503387837-b154d5074bd2", 
-                        caption="Construction Blueprint Example 1", use_container_width=True)
-                st.image("https://images.unsplash.com/photo-1503387762-592deb58ef4e", 
-                        caption="Construction Blueprint Example 3", use_container_width=True)
-            with col2:
-                st.image("https://images.unsplash.com/photo-1627660080110-20045fd3875d", 
-                        caption="Construction Blueprint Example 2", use_container_width=True)
-                st.image("https://images.unsplash.com/photo-1542621334-a254cf47733d", 
-                        caption="Construction Blueprint Example 4", use_container_width=True)
+        show_example_images(EXAMPLE_BLUEPRINTS)
     
     if uploaded_file is not None:
-        # Save the uploaded image
-        image = Image.open(uploaded_file)
+        # Save the uploaded image (decoded once per file, not on every rerun)
+        image = _open_image(uploaded_file.getvalue())
         st.session_state.uploaded_image = image
         
         # Show the uploaded image
-        st.image(image, caption="Uploaded Blueprint", use_container_width=True)
+        st.image(image, caption="Uploaded Blueprint", width="stretch")
         
         # Process button
         if st.button("Process Blueprint"):
             with st.spinner("Analyzing blueprint..."):
+                # Results are cached by image contents and project information
+                img_bytes = uploaded_file.getvalue()
+                project_info = ProjectInfo.from_dict(st.session_state.project_info)
+                
                 # Preprocess the image
-                processed_img = preprocess_image(image)
+                processed_img = _cached_preprocess(img_bytes)
                 st.session_state.processed_image = processed_img
                 
-                # Extract features
-                features = extract_features(processed_img)
-                
-                # Analyze the blueprint
-                analysis_result = analyze_blueprint(features)
+                # Analyze the blueprint (extracts features on a cache miss)
+                analysis_result = _cached_analyze(img_bytes)
                 
                 # Estimate materials
-                materials = estimate_materials(analysis_result, st.session_state.project_info)
+                materials = _cached_materials(analysis_result, project_info)
                 st.session_state.materials = materials
                 
                 # Generate schedule
-                schedule = generate_schedule(analysis_result, st.session_state.project_info)
+                schedule = _cached_schedule(analysis_result, project_info, date.today())
                 st.session_state.schedule = schedule
                 
                 st.success("Blueprint analysis complete! Check the Material Estimation and Construction Schedule tabs.")
@@ -154,322 +1501,164 @@ with tab2:
     
     if st.session_state.materials is None:
         st.info("Please upload and process a blueprint first.")
-        
-        # Option to show/hide examples to improve performance
-        show_examples = st.checkbox("Show Example Building Materials", value=False)
-        
-        # Display example construction materials only if requested
-        if show_examples:
-            st.subheader("Example Building Materials")
-            with st.spinner("Loading example images..."):
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.image("https://images.unsplash.com/photo-1627882206813-8c1ffd86efec", 
-                            caption="Building Materials Example 1", use_container_width=True)
-                    st.image("https://images.unsplash.com/photo-1595414440701-da000c40df9c", 
-                            caption="Building Materials Example 3", use_container_width=True)
-                with col2:
-                    st.image("https://images.unsplash.com/photo-1609867271967-a82f85c48531", 
-                            caption="Building Materials Example 2", use_container_width=True)
-                    st.image("https://images.unsplash.com/photo-1504307651254-35680f356dfd", 
-                            caption="Building Materials Example 4", use_container_width=True)
-    else:
-        # Add settings for currency and unit conversion
-        st.subheader("Settings")
-        
-        settings_col1, settings_col2 = st.columns(2)
-        
-        # Currency selection
-        with settings_col1:
-            # Currency conversion rates (USD to other currencies)
-            currency_rates = {
-                "USD": 1.0,
-                "INR": 83.5,  # Indian Rupee
-                "EUR": 0.92,  # Euro
-                "GBP": 0.79,  # British Pound
-                "JPY": 151.2, # Japanese Yen
-                "CNY": 7.22,  # Chinese Yuan
-                "AUD": 1.50,  # Australian Dollar
-                "CAD": 1.36,  # Canadian Dollar
-            }
-            
-            currency_symbols = {
-                "USD": "$",
-                "INR": "₹",
-                "EUR": "€",
-                "GBP": "£",
-                "JPY": "¥",
-                "CNY": "¥",
-                "AUD": "A$",
-                "CAD": "C$",
-            }
-            
-            selected_currency = st.selectbox(
-                "Select Currency:", 
-                options=list(currency_rates.keys()),
-                format_func=lambda x: f"{x} ({currency_symbols[x]})",
-                index=1  # Default to INR
-            )
-            
-            # Store the conversion rate
-            conversion_rate = currency_rates[selected_currency]
-            currency_symbol = currency_symbols[selected_currency]
-            
-        # Unit conversion selection
-        with settings_col2:
-            # Unit conversion options and rates
-            unit_conversions = {
-                "No Conversion": {
-                    "cubic yards": (1.0, "cubic yards"),
-                    "sq ft": (1.0, "sq ft"),
-                    "linear feet": (1.0, "linear feet"),
-                    "pieces": (1.0, "pieces"),
-                    "tons": (1.0, "tons"),
-                    "gallons": (1.0, "gallons")
-                },
-                "Metric": {
-                    "cubic yards": (0.764555, "cubic meters"),
-                    "sq ft": (0.092903, "sq meters"),
-                    "linear feet": (0.3048, "meters"),
-                    "pieces": (1.0, "pieces"),
-                    "tons": (0.907185, "tonnes"),
-                    "gallons": (3.78541, "liters")
-                },
-                "Imperial (UK)": {
-                    "cubic yards": (0.764555, "cubic yards"),
-                    "sq ft": (0.092903, "sq feet"),
-                    "linear feet": (0.3048, "feet"),
-                    "pieces": (1.0, "pieces"),
-                    "tons": (1.0, "tons"),
-                    "gallons": (0.832674, "imp. gallons")
-                }
-            }
-            
-            selected_unit_system = st.selectbox(
-                "Select Unit System:",
-                options=list(unit_conversions.keys()),
-                index=1  # Default to Metric
-            )
-            
-            # Store the unit conversion dictionary
-            unit_converters = unit_conversions[selected_unit_system]
-        
-        # Function to convert material values based on settings
-        def convert_material(item):
-            # Copy the original item
-            converted_item = item.copy()
-            
-            # Apply currency conversion to cost
-            if 'cost' in item:
-                converted_item['cost'] = item['cost'] * conversion_rate
-            
-            # Apply currency conversion to cost_per_unit if it exists
-            if 'cost_per_unit' in item:
-                converted_item['cost_per_unit'] = item['cost_per_unit'] * conversion_rate
-            else:
-                # Calculate cost per unit if not present
-                if 'cost' in item and 'quantity' in item and item['quantity'] > 0:
-                    converted_item['cost_per_unit'] = item['cost'] / item['quantity']
-                else:
-                    converted_item['cost_per_unit'] = 0
-            
-            # Apply unit conversion if needed
-            if 'unit' in item:
-                original_unit = item['unit']
-                if original_unit in unit_converters:
-                    factor, new_unit = unit_converters[original_unit]
-                    if 'quantity' in item:
-                        converted_item['quantity'] = item['quantity'] * factor
-                    converted_item['unit'] = new_unit
-                    # Adjust cost per unit based on the new unit
-                    if 'cost_per_unit' in converted_item and factor > 0:
-                        converted_item['cost_per_unit'] = converted_item['cost_per_unit'] / factor
-            
-            # Format cost values for display
-            if 'cost' in converted_item:
-                converted_item['display_cost'] = f"{currency_symbol}{converted_item['cost']:,.2f}"
-            if 'cost_per_unit' in converted_item:
-                converted_item['display_cost_per_unit'] = f"{currency_symbol}{converted_item['cost_per_unit']:,.2f}"
-            
-            return converted_item
-            
-        # Convert all materials based on selected currency and units
-        converted_materials = [convert_material(item) for item in st.session_state.materials]
-        
-        # Create material categories
-        concrete_materials = [item for item in converted_materials if item['category'] == 'Concrete']
-        steel_materials = [item for item in converted_materials if item['category'] == 'Steel']
-        masonry_materials = [item for item in converted_materials if item['category'] == 'Masonry']
-        finishing_materials = [item for item in converted_materials if item['category'] == 'Finishing']
-        other_materials = [item for item in converted_materials if item['category'] == 'Other']
-        
-        # Add a note about conversions
-        st.info(f"💡 Note: All costs are shown in {selected_currency} ({currency_symbol}) and measurements in {selected_unit_system} system. Original data remains unchanged in the system.")
-        
-        # Create tabs for material categories
-        mat_tab1, mat_tab2, mat_tab3, mat_tab4, mat_tab5 = st.tabs(["Concrete", "Steel", "Masonry", "Finishing", "Other"])
-        
-        with mat_tab1:
-            st.subheader("Concrete Materials")
-            if concrete_materials:
-                df = pd.DataFrame(concrete_materials)
-                st.dataframe(df, use_container_width=True)
-                
-                # Create a pie chart for concrete materials
-                fig = px.pie(df, values='quantity', names='name', title='Concrete Materials Distribution')
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No concrete materials estimated for this project.")
-                
-        with mat_tab2:
-            st.subheader("Steel Materials")
-            if steel_materials:
-                df = pd.DataFrame(steel_materials)
-                st.dataframe(df, use_container_width=True)
-                
-                # Create a bar chart for steel materials
-                # Simplified steel materials bar chart
-                fig = px.bar(
-                    df, 
-                    x='name', 
-                    y='quantity', 
-                    title='Steel Materials Quantities',
-                    color_discrete_sequence=['#1f77b4']  # Single blue color
-                )
-                fig.update_layout(
-                    xaxis_title="Material Name", 
-                    yaxis_title="Quantity",
-                    showlegend=False,  # Remove legend
-                    plot_bgcolor='white'  # Clean white background
-                )
-                # Simplify bar appearance
-                fig.update_traces(
-                    marker_line_width=1,
-                    marker_line_color="white",
-                    opacity=0.8
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No steel materials estimated for this project.")
-                
-        with mat_tab3:
-            st.subheader("Masonry Materials")
-            if masonry_materials:
-                df = pd.DataFrame(masonry_materials)
-                st.dataframe(df, use_container_width=True)
-                
-                # Create a bar chart for masonry materials
-                # Simplified masonry materials bar chart
-                fig = px.bar(
-                    df, 
-                    x='name', 
-                    y='quantity', 
-                    title='Masonry Materials Quantities',
-                    color_discrete_sequence=['#ff7f0e']  # Single orange color
-                )
-                fig.update_layout(
-                    xaxis_title="Material Name", 
-                    yaxis_title="Quantity",
-                    showlegend=False,  # Remove legend
-                    plot_bgcolor='white'  # Clean white background
-                )
-                # Simplify bar appearance
-                fig.update_traces(
-                    marker_line_width=1,
-                    marker_line_color="white",
-                    opacity=0.8
+        
+        # Option to show/hide examples to improve performance
+        show_examples = st.checkbox("Show Example Building Materials", value=False)
+        
+        # Display example construction materials only if requested
+        if show_examples:
+            st.subheader("Example Building Materials")
+            show_example_images(EXAMPLE_MATERIALS)
+    else:
+        # Run the materials panel as a fragment so currency and unit changes
+        # only rerun this tab
+        @st.fragment
+        def materials_panel():
+            # Add settings for currency and unit conversion
+            st.subheader("Settings")
+            
+            settings_col1, settings_col2 = st.columns(2)
+            
+            # Currency selection
+            with settings_col1:
+                selected_currency = st.selectbox(
+                    "Select Currency:", 
+                    options=list(CURRENCY_RATES.keys()),
+                    format_func=lambda x: f"{x} ({CURRENCY_SYMBOLS[x]})",
+                    index=1  # Default to INR
                 )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No masonry materials estimated for this project.")
                 
-        with mat_tab4:
-            st.subheader("Finishing Materials")
-            if finishing_materials:
-                df = pd.DataFrame(finishing_materials)
-                st.dataframe(df, use_container_width=True)
+                # Store the conversion rate
+                conversion_rate = CURRENCY_RATES[selected_currency]
+                currency_symbol = CURRENCY_SYMBOLS[selected_currency]
                 
-                # Create a bar chart for finishing materials
-                # Simplified finishing materials bar chart
-                fig = px.bar(
-                    df, 
-                    x='name', 
-                    y='quantity', 
-                    title='Finishing Materials Quantities',
-                    color_discrete_sequence=['#2ca02c']  # Single green color
-                )
-                fig.update_layout(
-                    xaxis_title="Material Name", 
-                    yaxis_title="Quantity",
-                    showlegend=False,  # Remove legend
-                    plot_bgcolor='white'  # Clean white background
+            # Unit conversion selection
+            with settings_col2:
+                selected_unit_system = st.selectbox(
+                    "Select Unit System:",
+                    options=list(UNIT_CONVERSIONS.keys()),
+                    index=1  # Default to Metric
                 )
-                # Simplify bar appearance
-                fig.update_traces(
-                    marker_line_width=1,
-                    marker_line_color="white",
-                    opacity=0.8
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No finishing materials estimated for this project.")
                 
-        with mat_tab5:
-            st.subheader("Other Materials")
-            if other_materials:
-                df = pd.DataFrame(other_materials)
-                st.dataframe(df, use_container_width=True)
-                
-                # Create a bar chart for other materials
-                # Simplified other materials bar chart
-                fig = px.bar(
-                    df, 
-                    x='name', 
-                    y='quantity', 
-                    title='Other Materials Quantities',
-                    color_discrete_sequence=['#9467bd']  # Single purple color
-                )
-                fig.update_layout(
-                    xaxis_title="Material Name", 
-                    yaxis_title="Quantity",
-                    showlegend=False,  # Remove legend
-                    plot_bgcolor='white'  # Clean white background
-                )
-                # Simplify bar appearance
-                fig.update_traces(
-                    marker_line_width=1,
-                    marker_line_color="white",
-                    opacity=0.8
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No other materials estimated for this project.")
-        
-        # Total cost calculation and display
-        total_cost = sum(item.get('cost', 0) for item in converted_materials)
-        st.metric("Total Estimated Material Cost", f"{currency_symbol}{total_cost:,.2f}")
-        
-        # Display a cost breakdown
-        st.subheader("Cost Breakdown by Category")
-        cost_by_category = {}
-        for item in converted_materials:
-            if item['category'] not in cost_by_category:
-                cost_by_category[item['category']] = 0
-            cost_by_category[item['category']] += item.get('cost', 0)
-        
-        cost_df = pd.DataFrame({
-            'Category': list(cost_by_category.keys()),
-            'Cost': list(cost_by_category.values())
-        })
-        
-        fig = px.pie(cost_df, values='Cost', names='Category', title=f'Material Cost Distribution ({currency_symbol})')
-        st.plotly_chart(fig, use_container_width=True)
+                # Look up the unit conversion factors and names
+                unit_factors, unit_names = UNIT_CONVERSION_SERIES[selected_unit_system]
+            
+            # Convert all materials based on selected currency and units
+            converted_df = convert_materials(
+                st.session_state.materials, conversion_rate, unit_factors, unit_names
+            )
+            cost_columns = cost_column_config(currency_symbol)
+            
+            # Create material categories
+            concrete_materials = converted_df[converted_df['category'] == 'Concrete'].reset_index(drop=True)
+            steel_materials = converted_df[converted_df['category'] == 'Steel'].reset_index(drop=True)
+            masonry_materials = converted_df[converted_df['category'] == 'Masonry'].reset_index(drop=True)
+            finishing_materials = converted_df[converted_df['category'] == 'Finishing'].reset_index(drop=True)
+            other_materials = converted_df[converted_df['category'] == 'Other'].reset_index(drop=True)
+            
+            # Add a note about conversions
+            st.info(f"💡 Note: All costs are shown in {selected_currency} ({currency_symbol}) and measurements in {selected_unit_system} system. Original data remains unchanged in the system.")
+            
+            # Create tabs for material categories
+            mat_tab1, mat_tab2, mat_tab3, mat_tab4, mat_tab5 = st.tabs(["Concrete", "Steel", "Masonry", "Finishing", "Other"])
+            
+            with mat_tab1:
+                st.subheader("Concrete Materials")
+                if not concrete_materials.empty:
+                    df = concrete_materials
+                    st.dataframe(df, width="stretch", column_config=cost_columns)
+                    
+                    # Create a pie chart for concrete materials
+                    fig = px.pie(df, values='quantity', names='name', title='Concrete Materials Distribution')
+                    st.plotly_chart(fig, width="stretch")
+                else:
+                    st.info("No concrete materials estimated for this project.")
+                    
+            with mat_tab2:
+                st.subheader("Steel Materials")
+                if not steel_materials.empty:
+                    df = steel_materials
+                    st.dataframe(df, width="stretch", column_config=cost_columns)
+                    
+                    # Create a bar chart for steel materials
+                    fig = build_category_bar(
+                        tuple(zip(df['name'], df['quantity'])),
+                        'Steel Materials Quantities',
+                        '#1f77b4'
+                    )
+                    st.plotly_chart(fig, width="stretch")
+                else:
+                    st.info("No steel materials estimated for this project.")
+                    
+            with mat_tab3:
+                st.subheader("Masonry Materials")
+                if not masonry_materials.empty:
+                    df = masonry_materials
+                    st.dataframe(df, width="stretch", column_config=cost_columns)
+                    
+                    # Create a bar chart for masonry materials
+                    fig = build_category_bar(
+                        tuple(zip(df['name'], df['quantity'])),
+                        'Masonry Materials Quantities',
+                        '#ff7f0e'
+                    )
+                    st.plotly_chart(fig, width="stretch")
+                else:
+                    st.info("No masonry materials estimated for this project.")
+                    
+            with mat_tab4:
+                st.subheader("Finishing Materials")
+                if not finishing_materials.empty:
+                    df = finishing_materials
+                    st.dataframe(df, width="stretch", column_config=cost_columns)
+                    
+                    # Create a bar chart for finishing materials
+                    fig = build_category_bar(
+                        tuple(zip(df['name'], df['quantity'])),
+                        'Finishing Materials Quantities',
+                        '#2ca02c'
+                    )
+                    st.plotly_chart(fig, width="stretch")
+                else:
+                    st.info("No finishing materials estimated for this project.")
+                    
+            with mat_tab5:
+                st.subheader("Other Materials")
+                if not other_materials.empty:
+                    df = other_materials
+                    st.dataframe(df, width="stretch", column_config=cost_columns)
+                    
+                    # Create a bar chart for other materials
+                    fig = build_category_bar(
+                        tuple(zip(df['name'], df['quantity'])),
+                        'Other Materials Quantities',
+                        '#9467bd'
+                    )
+                    st.plotly_chart(fig, width="stretch")
+                else:
+                    st.info("No other materials estimated for this project.")
+            
+            # Total cost calculation and display
+            total_cost = float(converted_df['cost'].sum())
+            st.metric("Total Estimated Material Cost", f"{currency_symbol}{total_cost:,.2f}")
+            
+            # Display a cost breakdown
+            st.subheader("Cost Breakdown by Category")
+            cost_df = (
+                converted_df.groupby('category', sort=False)['cost'].sum()
+                .rename_axis('Category').reset_index(name='Cost')
+            )
+            
+            fig = px.pie(cost_df, values='Cost', names='Category', title=f'Material Cost Distribution ({currency_symbol})')
+            st.plotly_chart(fig, width="stretch")
+            
+        materials_panel()
 
 # Tab 3: Construction Schedule
 with tab3:
     st.header("Construction Schedule")
     
-    if st.session_state.schedule is None:
+    if not st.session_state.schedule:
         st.info("Please upload and process a blueprint first.")
         
         # Option to show/hide examples to improve performance
@@ -477,32 +1666,11 @@ with tab3:
         
         # Display example construction sites and schedules only if requested
         if show_examples:
-            with st.spinner("Loading example images..."):
-                st.subheader("Example Construction Progress")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.image("https://images.unsplash.com/photo-1504917595217-d4dc5ebe6122", 
-                            caption="Construction Site Example 1", use_container_width=True)
-                    st.image("https://images.unsplash.com/photo-1489514354504-1653aa90e34e", 
-                            caption="Construction Site Example 3", use_container_width=True)
-                with col2:
-                    st.image("https://images.unsplash.com/photo-1541888946425-d81bb19240f5", 
-                            caption="Construction Site Example 2", use_container_width=True)
-                    st.image("https://images.unsplash.com/photo-1429497419816-9ca5cfb4571a", 
-                            caption="Construction Site Example 4", use_container_width=True)
-                    
-                st.subheader("Example Schedule Charts")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.image("https://images.unsplash.com/photo-1541888946425-d81bb19240f5", 
-                            caption="Schedule Chart Example 1", use_container_width=True)
-                    st.image("https://images.unsplash.com/photo-1429497419816-9ca5cfb4571a", 
-                            caption="Schedule Chart Example 3", use_container_width=True)
-                with col2:
-                    st.image("https://images.unsplash.com/photo-1489514354504-1653aa90e34e", 
-                            caption="Schedule Chart Example 2", use_container_width=True)
-                    st.image("https://images.unsplash.com/photo-1531834685032-c34bf0d84c77", 
-                            caption="Schedule Chart Example 4", use_container_width=True)
+            st.subheader("Example Construction Progress")
+            show_example_images(EXAMPLE_CONSTRUCTION_SITES)
+            
+            st.subheader("Example Schedule Charts")
+            show_example_images(EXAMPLE_SCHEDULE_CHARTS)
     else:
         # Convert schedule to DataFrame
         df = pd.DataFrame(st.session_state.schedule)
@@ -538,174 +1706,110 @@ with tab3:
             st.info("✏️ Manually adjust completion percentages for each task below.")
         
         # Display the schedule dataframe (read-only)
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(df, width="stretch")
         
         # If manual mode, show editable inputs for each task
         if completion_mode == "Enter manually":
-            # Initialize manual_completion if needed
-            if 'manual_completion' not in st.session_state:
-                st.session_state.manual_completion = {}
-                # Initialize once with calculated values
-                for i, task in enumerate(st.session_state.schedule):
-                    task_id = f"{i}_{task['task_name'].replace(' ', '_')}"
-                    
-                    # Calculate initial completion percentage (simple version)
-                    start = get_date(task['start_date'])
-                    end = get_date(task['end_date'])
-                    today = datetime.now().date()
-                    
-                    if today < start:
-                        auto_completion = 0
-                    elif today > end:
-                        auto_completion = 100
-                    else:
-                        duration = max(1, (end - start).days)
-                        days_passed = (today - start).days
-                        auto_completion = min(100, max(0, int((days_passed / duration) * 100)))
-                    
-                    # Store the auto-calculated value
-                    st.session_state.manual_completion[task_id] = auto_completion
-            
-            # Create expanders for each phase to group tasks
-            phases = sorted(list(set(task['phase'] for task in st.session_state.schedule)))
-            
-            for phase in phases:
-                with st.expander(f"Phase: {phase}", expanded=False):
-                    # Get tasks for this phase
-                    phase_tasks = [(i, task) for i, task in enumerate(st.session_state.schedule) if task['phase'] == phase]
-                    
-                    # Create a grid of sliders with fewer columns for better performance
-                    cols_per_row = 2  # Reduced from 3 to 2 for better performance
-                    
-                    # Group tasks into rows
-                    for i in range(0, len(phase_tasks), cols_per_row):
-                        # Create columns for this row
-                        cols = st.columns(cols_per_row)
-                        
-                        # Add tasks to each column
-                        for j in range(cols_per_row):
-                            if i + j < len(phase_tasks):
-                                task_idx, task = phase_tasks[i + j]
-                                task_id = f"{task_idx}_{task['task_name'].replace(' ', '_')}"
-                                
-                                with cols[j]:
-                                    # Create a unique key for each slider
-                                    st.session_state.manual_completion[task_id] = st.slider(
-                                        f"{task['task_name']}",
-                                        0, 100, 
-                                        st.session_state.manual_completion.get(task_id, 0),
-                                        key=f"completion_{task_id}"
-                                    )
-            
-            # Display a summary visualization of completion percentages by phase
-            st.subheader("Phase Completion Summary")
-            
-            # Group tasks by phase and calculate average completion percentage
-            phase_completion = {}
-            for i, task in enumerate(st.session_state.schedule):
-                phase = task['phase']
-                task_id = f"{i}_{task['task_name'].replace(' ', '_')}"
-                
-                if phase not in phase_completion:
-                    phase_completion[phase] = {'total': 0, 'count': 0, 'tasks': []}
-                
-                completion_value = st.session_state.manual_completion.get(task_id, 0)
-                phase_completion[phase]['total'] += completion_value
-                phase_completion[phase]['count'] += 1
-                phase_completion[phase]['tasks'].append({
-                    'Task': task['task_name'],
-                    'Completion': completion_value
-                })
-            
-            # Calculate average for each phase and prepare data for charts
-            summary_data = []
-            task_level_data = []
-            
-            for phase, data in phase_completion.items():
-                if data['count'] > 0:
-                    avg_percentage = data['total'] / data['count']
-                    summary_data.append({
-                        'Phase': phase,
-                        'Average Completion': avg_percentage,
-                        'Number of Tasks': data['count']
-                    })
-                    
-                    # Add individual task data for this phase
-                    for task_data in data['tasks']:
-                        task_level_data.append({
-                            'Phase': phase,
-                            'Task': task_data['Task'],
-                            'Completion': task_data['Completion']
-                        })
-            
-            # Create summary visualization
-            if summary_data:
-                summary_df = pd.DataFrame(summary_data)
-                
-                # Create a colorful bar chart for phase completion percentages
-                fig = px.bar(
-                    summary_df,
-                    x='Phase',
-                    y='Average Completion',
-                    title='Average Completion Percentage by Phase',
-                    text='Average Completion',
-                    color='Average Completion',
-                    color_continuous_scale=[(0, "red"), (0.5, "yellow"), (1, "green")],
-                    range_color=[0, 100],
-                    hover_data=['Number of Tasks']
-                )
-                
-                fig.update_traces(
-                    texttemplate='%{text:.1f}%',
-                    textposition='outside',
-                    marker_line_width=1.5,
-                    marker_line_color='white'
+            # Run the editor and summary as a fragment so edits only rerun this panel
+            @st.fragment
+            def completion_panel():
+                # Initialize manual_completion if needed
+                if 'manual_completion' not in st.session_state:
+                    # Initialize once with values calculated from the task dates
+                    task_ids = [
+                        f"{i}_{task['task_name'].replace(' ', '_')}"
+                        for i, task in enumerate(st.session_state.schedule)
+                    ]
+                    auto_completion = completion_from_dates(st.session_state.schedule, datetime.now().date())
+                    st.session_state.manual_completion = dict(zip(task_ids, auto_completion.tolist()))
+                
+                # Build the editor table, grouped by phase, only when the editor is
+                # first shown; keeping its input fixed afterwards preserves the edits
+                if 'completion_editor' not in st.session_state:
+                    editor_rows = []
+                    for phase, phase_tasks in group_tasks_by_phase(st.session_state.schedule).items():
+                        for task_idx, task in phase_tasks:
+                            task_id = f"{task_idx}_{task['task_name'].replace(' ', '_')}"
+                            editor_rows.append({
+                                'Task ID': task_id,
+                                'Phase': phase,
+                                'Task': task['task_name'],
+                                'Completion': st.session_state.manual_completion.get(task_id, 0)
+                            })
+                    st.session_state.completion_editor_base = pd.DataFrame(editor_rows).set_index('Task ID')
+                
+                # Edit all completion percentages in a single table
+                edited_completion = st.data_editor(
+                    st.session_state.completion_editor_base,
+                    column_config={
+                        'Completion': st.column_config.NumberColumn(
+                            'Completion (%)', min_value=0, max_value=100, step=1, required=True
+                        )
+                    },
+                    disabled=['Phase', 'Task'],
+                    hide_index=True,
+                    width="stretch",
+                    key='completion_editor'
                 )
-                
-                fig.update_layout(
-                    yaxis_range=[0, 105],  # Set y-axis range from 0 to 105 to make room for labels
-                    yaxis_title='Completion Percentage',
-                    xaxis_title='Construction Phase',
-                    coloraxis_showscale=False,
-                    height=300
+                st.session_state.manual_completion.update(
+                    zip(edited_completion.index, edited_completion['Completion'].astype(int).tolist())
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Also create a detailed task-level heatmap if there are many tasks
-                if len(task_level_data) > 5:
-                    task_df = pd.DataFrame(task_level_data)
-                    
-                    # Create a heatmap of task completion by phase
-                    fig2 = px.density_heatmap(
-                        task_df,
-                        x='Phase',
-                        y='Task',
-                        z='Completion',
-                        title='Task Completion Heatmap',
-                        color_continuous_scale=[(0, "red"), (0.5, "yellow"), (1, "green")],
-                        range_color=[0, 100]
-                    )
+                # Display a summary visualization of completion percentages by phase
+                st.subheader("Phase Completion Summary")
+                
+                # Collect the completion values as columns, then average them per
+                # phase in first-seen phase order
+                task_level_df = pd.DataFrame({
+                    'Phase': [task['phase'] for task in st.session_state.schedule],
+                    'Task': [task['task_name'] for task in st.session_state.schedule],
+                    'Completion': [
+                        st.session_state.manual_completion.get(f"{i}_{task['task_name'].replace(' ', '_')}", 0)
+                        for i, task in enumerate(st.session_state.schedule)
+                    ]
+                })
+                summary_df = task_level_df.groupby('Phase', sort=False)['Completion'].agg(['mean', 'size'])
+                
+                # List the tasks grouped by phase, keeping schedule order within each phase
+                phase_order = pd.factorize(task_level_df['Phase'])[0]
+                task_level_df = task_level_df.iloc[np.argsort(phase_order, kind='stable')]
+                
+                # Create summary visualization
+                if not summary_df.empty:
+                    # Create a colorful bar chart for phase completion percentages
+                    fig = build_phase_completion_bar(tuple(zip(
+                        summary_df.index.tolist(),
+                        summary_df['mean'].tolist(),
+                        summary_df['size'].tolist()
+                    )))
+                    st.plotly_chart(fig, width="stretch")
                     
-                    fig2.update_layout(
-                        xaxis_title='Construction Phase',
-                        yaxis_title='Task',
-                        coloraxis_colorbar=dict(title='Completion %'),
-                        height=400
-                    )
+                    # Also create a detailed task-level heatmap if there are many tasks
+                    if len(task_level_df) > 5:
+                        fig2 = build_completion_heatmap(tuple(zip(
+                            task_level_df['Phase'].tolist(),
+                            task_level_df['Task'].tolist(),
+                            task_level_df['Completion'].tolist()
+                        )))
+                        st.plotly_chart(fig2, width="stretch")
+                
+                # Button to apply manual percentages to the schedule
+                if st.button("Apply Completion Percentages", type="primary"):
+                    # Update the completion percentages in the schedule
+                    with st.spinner("Applying completion percentages..."):
+                        for i, task in enumerate(st.session_state.schedule):
+                            task_id = f"{i}_{task['task_name'].replace(' ', '_')}"
+                            task['manual_completion'] = st.session_state.manual_completion[task_id]
                     
-                    st.plotly_chart(fig2, use_container_width=True)
-            
-            # Button to apply manual percentages to the schedule
-            if st.button("Apply Completion Percentages", type="primary"):
-                # Update the completion percentages in the schedule
-                with st.spinner("Applying completion percentages..."):
-                    for i, task in enumerate(st.session_state.schedule):
-                        task_id = f"{i}_{task['task_name'].replace(' ', '_')}"
-                        task['manual_completion'] = st.session_state.manual_completion[task_id]
+                    st.session_state.using_manual_completion = True
+                    st.session_state.completion_applied = True
+                    # The rest of the page reads the applied values, so rerun all of it
+                    st.rerun()
+                
+                if st.session_state.pop('completion_applied', False):
+                    st.success("✅ Completion percentages have been applied to the schedule!")
                 
-                st.success("✅ Completion percentages have been applied to the schedule!")
-                st.session_state.using_manual_completion = True
+            completion_panel()
         
         # Create an enhanced 3D construction timeline visualization
         st.subheader("3D Construction Timeline Visualization")
@@ -791,22 +1895,33 @@ with tab3:
                 st.session_state.schedule_view_end_date = max_date
                 st.rerun()
 
-        # Filter the schedule based on the selected date range
-        filtered_schedule = [
-            task for task in st.session_state.schedule.copy() 
-            if (
-                # Task starts before or on end_date AND ends on or after start_date
-                get_date(task['start_date']) <= end_date and 
-                get_date(task['end_date']) >= start_date
-            )
-        ]
+        # Filter the schedule with boolean masks over per-task columns instead of
+        # rebuilding the task list for each filter
+        task_starts = np.array(all_start_dates, dtype='datetime64[D]')
+        task_ends = np.array(all_end_dates, dtype='datetime64[D]')
+        task_resources = np.array([task['responsible_party'] for task in st.session_state.schedule])
+        task_phases = np.array([task['phase'] for task in st.session_state.schedule])
+        
+        # Summarize completion over the whole schedule; the summary is cached
+        # on the task contents, so reruns from unrelated widgets skip it
+        using_manual_completion = st.session_state.get('using_manual_completion', False)
+        task_rows = tuple(
+            (start, end, task['phase'], task.get('manual_completion'))
+            for start, end, task in zip(all_start_dates, all_end_dates, st.session_state.schedule)
+        )
+        overall_completion, task_counts, phase_completion_df, phase_df, timeline_df = summarize_schedule(
+            task_rows, today, using_manual_completion
+        )
+        
+        # Task starts before or on end_date AND ends on or after start_date
+        task_mask = (task_starts <= np.datetime64(end_date)) & (task_ends >= np.datetime64(start_date))
         
         # Show the selected date range
         date_format = "%B %d, %Y"  # Format like "January 15, 2025"
         st.info(f"Showing tasks from **{start_date.strftime(date_format)}** to **{end_date.strftime(date_format)}**")
             
         # Add resource filter
-        resources = sorted(list(set(task['responsible_party'] for task in filtered_schedule)))
+        resources = np.unique(task_resources[task_mask]).tolist()
         selected_resources = st.multiselect(
             "Filter by Responsible Party:",
             options=resources,
@@ -815,11 +1930,10 @@ with tab3:
         
         # Filter by selected resources
         if selected_resources:
-            filtered_schedule = [task for task in filtered_schedule 
-                              if task['responsible_party'] in selected_resources]
+            task_mask &= np.isin(task_resources, selected_resources)
         
         # Add phase filter
-        phases = sorted(list(set(task['phase'] for task in filtered_schedule)))
+        phases = np.unique(task_phases[task_mask]).tolist()
         selected_phases = st.multiselect(
             "Filter by Construction Phase:",
             options=phases,
@@ -828,8 +1942,10 @@ with tab3:
         
         # Filter by selected phases
         if selected_phases:
-            filtered_schedule = [task for task in filtered_schedule 
-                              if task['phase'] in selected_phases]
+            task_mask &= np.isin(task_phases, selected_phases)
+        
+        filtered_indices = np.flatnonzero(task_mask)
+        filtered_schedule = [st.session_state.schedule[i] for i in filtered_indices]
         
         if not filtered_schedule:
             st.warning("No tasks match the selected filters. Please adjust your filter settings.")
@@ -841,535 +1957,131 @@ with tab3:
             # 3D Timeline visualization - main visualization
             
             # Create an infographic dataset with 3D coordinates
-            today = datetime.now().date()
-            
-            # Add a debug message
-            st.write(f"Current date for calculations: {today}")
-            
             # Group tasks by phase for cleaner presentation
-            phases = sorted(list(set(task['phase'] for task in filtered_schedule)))
-            
-            # Initialize variables first
-            threed_data = []
-            project_start = None
-            project_end = None
-            project_duration = 0
-            show_3d_viz = False
-            
-            # Add option to toggle 3D visualization
-            show_3d = st.checkbox("Show 3D Visualization", value=False, 
-                               help="Enable/disable the 3D visualization to improve performance")
-            
-            if not show_3d:
-                st.info("3D visualization is disabled to improve performance. Check the box above to enable it.")
-            else:
-                # Add a loading indicator
-                with st.spinner("Preparing 3D visualization..."):
-                    # Normalize dates once before processing
-                    normalized_schedule = []
-                    for task in filtered_schedule:
-                        task_copy = task.copy()
-                        
-                        # Convert string dates to date objects
-                        if isinstance(task_copy['start_date'], str):
-                            task_copy['start_date'] = datetime.strptime(task_copy['start_date'], '%Y-%m-%d').date()
-                        elif isinstance(task_copy['start_date'], datetime):
-                            task_copy['start_date'] = task_copy['start_date'].date()
-                        
-                        if isinstance(task_copy['end_date'], str):
-                            task_copy['end_date'] = datetime.strptime(task_copy['end_date'], '%Y-%m-%d').date()
-                        elif isinstance(task_copy['end_date'], datetime):
-                            task_copy['end_date'] = task_copy['end_date'].date()
-                            
-                        normalized_schedule.append(task_copy)
-                    
-                    # Calculate the project timeline parameters once
-                    all_start_dates = [task['start_date'] for task in normalized_schedule]  # Already normalized
-                    all_end_dates = [task['end_date'] for task in normalized_schedule]  # Already normalized
-                    
-                    project_start = min(all_start_dates)
-                    project_end = max(all_end_dates)
-                    project_duration = max(1, (project_end - project_start).days)
-                    
-                    # Add message for project timeline
-                    st.write(f"Project timeline: {project_start} to {project_end} ({project_duration} days)")
-                    
-                    # Group tasks by phase for more efficient processing
-                    phase_groups = {}
-                    for phase in phases:
-                        phase_groups[phase] = []
-                        
-                    # Pre-sort tasks into phases
-                    for task in normalized_schedule:
-                        phase_groups[task['phase']].append(task)
-                    
-                    # Process each phase group
-                    for phase_idx, phase in enumerate(phases):
-                        # Get and sort tasks for this phase
-                        phase_tasks = sorted(phase_groups[phase], key=lambda x: x['start_date'])
-                        
-                        # Process only a limited number of tasks if there are too many
-                        max_tasks_per_phase = 25  # Limit for performance
-                        if len(phase_tasks) > max_tasks_per_phase:
-                            st.warning(f"Phase '{phase}' has {len(phase_tasks)} tasks. Showing only {max_tasks_per_phase} for performance reasons.")
-                            # Choose tasks distributed across the timeline
-                            step = len(phase_tasks) // max_tasks_per_phase
-                            phase_tasks = [phase_tasks[i] for i in range(0, len(phase_tasks), step)][:max_tasks_per_phase]
-                        
-                        # For each task in this phase
-                        for task_idx, task in enumerate(phase_tasks):
-                            # Use normalized date objects
-                            start = task['start_date']
-                            end = task['end_date']
-                            duration = (end - start).days
-                            
-                            # Use manual completion percentage if available
-                            if hasattr(st.session_state, 'using_manual_completion') and st.session_state.using_manual_completion and 'manual_completion' in task:
-                                completion = task['manual_completion']
-                            else:
-                                # Calculate completion based on dates
-                                days_passed = (today - start).days
-                                
-                                if days_passed < 0:  # Task hasn't started yet
-                                    completion = 0
-                                elif days_passed >= duration:  # Task is complete
-                                    completion = 100
-                                else:  # Task is in progress
-                                    completion = min(100, max(0, int((days_passed / duration) * 100)))
-                            
-                            # Simplified color calculation
-                            if task.get('critical_path', False):
-                                # Red to green for critical path
-                                color = f'rgb({255-int(2.55*completion)},{int(2.55*completion)},0)'
-                            else:
-                                # Blue-based for regular tasks
-                                color = f'rgb({50+int(completion)},{100+int(1.5*completion)},{200+int(0.55*completion)})'
-                            
-                            # Add to the 3D dataset with simplified calculations
-                            threed_data.append({
-                                'task': task['task_name'],
-                                'phase': phase,
-                                'resource': task.get('responsible_party', 'Unassigned'),
-                                'start': start.strftime('%Y-%m-%d'),
-                                'end': end.strftime('%Y-%m-%d'),
-                                'duration': duration,
-                                'x': (start - project_start).days / project_duration,
-                                'y': phase_idx,
-                                'z': max(0.02, duration / project_duration) / 2,  # Center point
-                                'width': max(0.02, duration / project_duration),  # Duration
-                                'height': 1.5 if task.get('critical_path', False) else 1.0,
-                                'completion': completion,
-                                'color': color,
-                                'critical': task.get('critical_path', False)
-                            })
-                    
-                    # Flag that 3D viz is ready
-                    show_3d_viz = True
-            
-            # Only create and display the visualization if enabled and data exists
-            if show_3d and threed_data and show_3d_viz:
-                # Convert to DataFrame for easier manipulation
-                df_3d = pd.DataFrame(threed_data)
-                
-                # Create 3D bar chart
-                fig = go.Figure()
-                
-                # Process each row in the dataframe
-                for _, row in df_3d.iterrows():
-                    # Create box shape with 3D effect
-                    fig.add_trace(go.Scatter3d(
-                        x=[row['x'], row['x'] + row['width'], row['x'] + row['width'], row['x'], row['x'],  # Base x positions
-                           row['x'], row['x'] + row['width'], row['x'] + row['width'], row['x']],  # Top x positions
-                        y=[row['y'], row['y'], row['y'], row['y'], row['y'],  # Base y positions
-                           row['y'] + row['height'], row['y'] + row['height'], row['y'] + row['height'], row['y'] + row['height']],  # Top y positions
-                        z=[0, 0, 0, 0, 0,  # Base z positions are all 0
-                           row['height'], row['height'], row['height'], row['height']],  # Top z positions
-                        mode='lines',
-                        line=dict(color=row['color'], width=10),
-                        hoverinfo='text',
-                        hovertext=f"<b>{row['task']}</b><br>" +
-                                 f"Phase: {row['phase']}<br>" +
-                                 f"Resource: {row['resource']}<br>" +
-                                 f"Start: {row['start']}<br>" +
-                                 f"End: {row['end']}<br>" +
-                                 f"Duration: {row['duration']} days<br>" +
-                                 f"Completion: {row['completion']}%<br>" +
-                                 f"Critical Path: {'Yes' if row['critical'] else 'No'}",
-                        name=row['task'],
-                        showlegend=False
-                    ))
-                    
-                    # Add a colored surface on top to create a more solid appearance
-                    fig.add_trace(go.Surface(
-                        x=[[row['x'], row['x'] + row['width']], 
-                           [row['x'], row['x'] + row['width']]],
-                        y=[[row['y'], row['y']], 
-                           [row['y'], row['y']]],
-                        z=[[row['height'], row['height']], 
-                           [row['height'], row['height']]],
-                        colorscale=[[0, row['color']], [1, row['color']]],
-                        showscale=False,
-                        hoverinfo='skip',
-                        showlegend=False,
-                        opacity=0.95
-                    ))
-                    
-                    # Add text label for task name
-                    fig.add_trace(go.Scatter3d(
-                        x=[row['x'] + row['width']/2],
-                        y=[row['y'] + row['height']/2],
-                        z=[row['height'] + 0.05],
-                        mode='text',
-                        text=f"{row['task']}<br>{row['completion']}%",
-                        hoverinfo='skip',
-                        textfont=dict(
-                            color='black',
-                            size=12
-                        ),
-                        showlegend=False
-                    ))
-                
-                # Add a ground plane for better depth perception
-                x_min, x_max = 0, 1
-                y_min, y_max = 0, len(phases)
-                grid_x, grid_y = np.meshgrid(np.linspace(x_min, x_max, 10), np.linspace(y_min, y_max, 10))
-                grid_z = np.zeros_like(grid_x)
-                
-                fig.add_trace(go.Surface(
-                    x=grid_x,
-                    y=grid_y,
-                    z=grid_z,
-                    colorscale=[[0, 'rgba(230, 230, 230, 0.5)'], [1, 'rgba(200, 200, 200, 0.5)']],
-                    showscale=False,
-                    hoverinfo='skip'
-                ))
-                
-                # Add phase labels on Y-axis
-                for i, phase in enumerate(phases):
-                    fig.add_trace(go.Scatter3d(
-                        x=[0],
-                        y=[i + 0.5],
-                        z=[0],
-                        mode='text',
-                        text=phase,
-                        textposition="middle left",
-                        textfont=dict(
-                            color='black',
-                            size=14,
-                            family='Arial, sans-serif'
-                        ),
-                        showlegend=False
-                    ))
-                
-                # Add timeline markers on X-axis (convert normalized positions back to dates)
-                date_markers = []
-                project_duration_days = (project_end - project_start).days
+            phases = np.unique(task_phases[task_mask]).tolist()
+            
+            # Run the 3D and 2D timelines as a fragment so toggling them only
+            # reruns these charts
+            @st.fragment
+            def timeline_panel():
+                # Build the task records, including each task's completion, once for
+                # both timelines so the 3D and 2D views always agree
+                with st.spinner("Preparing timeline..."):
+                    # Flatten the tasks into hashable rows with normalized dates so
+                    # reruns that leave the filters unchanged reuse the cached layout
+                    schedule_rows = tuple(
+                        (
+                            task['task_name'],
+                            task['phase'],
+                            task.get('responsible_party', 'Unassigned'),
+                            all_start_dates[i],
+                            all_end_dates[i],
+                            task.get('critical_path', False),
+                            task.get('manual_completion')
+                        )
+                        for i, task in zip(filtered_indices, filtered_schedule)
+                    )
+                    using_manual_completion = st.session_state.get('using_manual_completion', False)
+                    threed_data, project_start, project_end, project_duration, capped_phases = build_threed_data(
+                        schedule_rows,
+                        tuple(phases),
+                        today,
+                        using_manual_completion
+                    )
                 
-                # Generate date markers at regular intervals
-                for i in range(0, 11):  # 0 to 10 points
-                    position = i / 10
-                    days_from_start = int(position * project_duration_days)
-                    marker_date = project_start + timedelta(days=days_from_start)
-                    date_markers.append((position, marker_date.strftime("%Y-%m-%d")))
+                # Add option to toggle 3D visualization
+                show_3d = st.checkbox("Show 3D Visualization", value=False, 
+                                   help="Enable/disable the 3D visualization to improve performance")
                 
-                # Add date labels
-                for pos, date_label in date_markers:
-                    fig.add_trace(go.Scatter3d(
-                        x=[pos],
-                        y=[-0.5],  # Just below the grid
-                        z=[0],
-                        mode='text',
-                        text=date_label,
-                        textposition="middle center",
-                        textfont=dict(
-                            color='black',
-                            size=10,
-                            family='Arial, sans-serif'
-                        ),
-                        showlegend=False
-                    ))
+                if not show_3d:
+                    st.info("3D visualization is disabled to improve performance. Check the box above to enable it.")
+                else:
+                    # Add message for project timeline
+                    st.write(f"Project timeline: {project_start} to {project_end} ({project_duration} days)")
                     
-                    # Add vertical lines for date markers
-                    fig.add_trace(go.Scatter3d(
-                        x=[pos, pos],
-                        y=[0, len(phases)],
-                        z=[0, 0],
-                        mode='lines',
-                        line=dict(
-                            color='rgba(150, 150, 150, 0.3)',
-                            width=2,
-                            dash='dash'
-                        ),
-                        showlegend=False
-                    ))
+                    for phase, task_count in capped_phases:
+                        st.warning(f"Phase '{phase}' has {task_count} tasks. Showing only {MAX_3D_TASKS_PER_PHASE} for performance reasons.")
                 
-                # Add today marker
-                today_normalized = (today - project_start).days / max(1, project_duration_days)
-                if 0 <= today_normalized <= 1:  # Check if today is within project timeframe
-                    fig.add_trace(go.Scatter3d(
-                        x=[today_normalized, today_normalized],
-                        y=[0, len(phases)],
-                        z=[0, 3],  # Make it tall enough to be visible
-                        mode='lines',
-                        line=dict(
-                            color='rgba(0, 200, 0, 0.8)',
-                            width=5
-                        ),
-                        name="Today",
-                        showlegend=True
-                    ))
+                # Only create and display the visualization if enabled and data exists
+                if show_3d and threed_data:
+                    # Reruns with the same filtered tasks reuse the cached figure
+                    fig = build_threed_figure(schedule_rows, tuple(phases), today, using_manual_completion)
                     
-                    fig.add_trace(go.Scatter3d(
-                        x=[today_normalized],
-                        y=[len(phases) + 0.5],
-                        z=[1.5],
-                        mode='text',
-                        text="TODAY",
-                        textposition="top center",
-                        textfont=dict(
-                            color='green',
-                            size=16,
-                            family='Arial Black, Arial Bold, Arial'
-                        ),
-                        showlegend=False
-                    ))
-                
-                # Add critical path indicator for legend
-                fig.add_trace(go.Scatter3d(
-                    x=[None], y=[None], z=[None],
-                    mode='markers',
-                    marker=dict(size=10, color='red'),
-                    name='Critical Path Tasks',
-                    showlegend=True
-                ))
-                
-                # Add regular task indicator for legend
-                fig.add_trace(go.Scatter3d(
-                    x=[None], y=[None], z=[None],
-                    mode='markers',
-                    marker=dict(size=10, color='rgb(0, 180, 230)'),
-                    name='Regular Tasks',
-                    showlegend=True
-                ))
-                
-                # Layout configuration
-                camera = dict(
-                    eye=dict(x=1.5, y=-1.5, z=1.25),
-                    up=dict(x=0, y=0, z=1)
-                )
-                
-                fig.update_layout(
-                    title={
-                        'text': '3D Construction Project Timeline',
-                        'font': {'size': 28, 'color': '#333', 'family': 'Arial Black, Arial Bold, Arial'},
-                        'x': 0.5,
-                        'y': 0.95,
-                        'xanchor': 'center'
-                    },
-                    width=1000,
-                    height=800,
-                    scene=dict(
-                        xaxis=dict(
-                            title='Project Timeline',
-                            showbackground=False,
-                            showgrid=False,
-                            showticklabels=False,
-                            zeroline=False
-                        ),
-                        yaxis=dict(
-                            title='Construction Phases',
-                            showbackground=False,
-                            showgrid=False,
-                            showticklabels=False,
-                            zeroline=False
-                        ),
-                        zaxis=dict(
-                            title='Task Importance',
-                            showbackground=False,
-                            showgrid=False,
-                            showticklabels=False,
-                            zeroline=False
-                        ),
-                        aspectratio=dict(x=1.5, y=1, z=0.5),
-                        camera=camera
-                    ),
-                    paper_bgcolor='rgba(250, 250, 250, 0.9)',
-                    legend=dict(
-                        font=dict(size=14),
-                        itemsizing='constant',
-                        bgcolor='rgba(255, 255, 255, 0.8)',
-                        bordercolor='rgba(0, 0, 0, 0.2)',
-                        borderwidth=1
-                    ),
-                    margin=dict(l=0, r=0, t=50, b=0),
-                )
-                
-                # Add interactive annotation
-                st.markdown("""
-                <div style="background-color:rgba(0,120,200,0.1); padding:10px; border-radius:5px; 
-                            text-align:center; border:1px solid rgba(0,120,200,0.2); margin-bottom:10px;">
-                    <p style="margin:0; color:#333;">
-                        <b>Interactive 3D View:</b> Click and drag to rotate | Scroll to zoom | Double-click to reset view
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Display the 3D visualization
-                st.plotly_chart(fig, use_container_width=True)
-            
-            # Add a 2D timeline for reference - make it optional for better performance
-            st.subheader("2D Timeline Reference")
-            
-            # Option to show/hide 2D timeline
-            show_2d = st.checkbox("Show 2D Timeline", value=True,
-                             help="Enable/disable the 2D timeline to improve performance")
-            
-            # Initialize timeline_df as None so we can check if it was created
-            timeline_df = None
-            
-            if not show_2d:
-                st.info("2D timeline is disabled to improve performance. Check the box above to enable it.")
-            elif not show_3d or 'threed_data' not in locals():
-                st.info("Enable the 3D visualization above to view the 2D timeline.")
-            else:
-                # Use simplified 2D timeline for better performance
-                with st.spinner("Preparing 2D timeline..."):
-                    # Convert data to Gantt chart format more efficiently
-                    gantt_data = []
+                    # Add interactive annotation
+                    st.markdown("""
+                    <div style="background-color:rgba(0,120,200,0.1); padding:10px; border-radius:5px; 
+                                text-align:center; border:1px solid rgba(0,120,200,0.2); margin-bottom:10px;">
+                        <p style="margin:0; color:#333;">
+                            <b>Interactive 3D View:</b> Click and drag to rotate | Scroll to zoom | Double-click to reset view
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
                     
-                    # Safely access threed_data with error handling
-                    try:
-                        # Limit number of tasks for performance
-                        max_tasks = 50
-                        if len(threed_data) > max_tasks:
-                            st.info(f"Showing {max_tasks} out of {len(threed_data)} tasks for better performance.")
-                            # Sample tasks evenly across the dataset
-                            indices = np.linspace(0, len(threed_data) - 1, max_tasks, dtype=int)
-                            tasks_to_show = [threed_data[i] for i in indices]
-                        else:
-                            tasks_to_show = threed_data
-                        
-                        # Directly use the completion values from 3D data to avoid recalculation
-                        for task in tasks_to_show:
-                            gantt_data.append({
-                                'Task': task['task'],
-                                'Start': task['start'],
-                                'Finish': task['end'],
-                                'Resource': task['resource'],
-                                'Phase': task['phase'],
-                                'Duration': task['duration'],
-                                'Critical': 'Yes' if task['critical'] else 'No',
-                                'Completion': task['completion']  # Already calculated in 3D visualization
-                            })
-                        
-                        # Create the timeline DataFrame directly with all data
-                        if gantt_data:
-                            timeline_df = pd.DataFrame(gantt_data)
-                    except Exception as e:
-                        st.warning(f"Could not create 2D timeline: {e}")
-                        timeline_df = None
-            
-            if show_2d and 'threed_data' in locals() and timeline_df is not None and len(timeline_df) > 0:
-                # Create a simplified 2D timeline
-                fig2d = px.timeline(
-                    timeline_df, 
-                    x_start='Start', 
-                    x_end='Finish', 
-                    y='Task', 
-                    color='Phase',
-                    color_discrete_sequence=px.colors.qualitative.Bold
-                )
+                    # Display the 3D visualization
+                    st.plotly_chart(fig, width="stretch")
                 
-                # Add today marker using a shape instead of vline to avoid type error
-                fig2d.add_shape(
-                    type="line",
-                    x0=today,
-                    x1=today,
-                    y0=0,
-                    y1=1,
-                    yref="paper",
-                    line=dict(
-                        color="green",
-                        width=2,
-                        dash="dash",
-                    )
-                )
-                
-                # Add Today label
-                fig2d.add_annotation(
-                    x=today,
-                    y=1.05,
-                    yref="paper",
-                    text="Today",
-                    showarrow=False,
-                    font=dict(
-                        color="green",
-                        size=12,
-                        family="Arial, sans-serif"
-                    )
-                )
+                # Add a 2D timeline for reference - make it optional for better performance
+                st.subheader("2D Timeline Reference")
                 
-                # Simplify layout
-                fig2d.update_layout(
-                    height=400,
-                    xaxis_title="Timeline",
-                    yaxis_title="Tasks",
-                    legend_title="Construction Phases",
-                    font=dict(family='Arial', size=12),
-                    uniformtext_minsize=10,
-                    uniformtext_mode='hide',
-                    plot_bgcolor='rgba(240, 240, 240, 0.8)',  # Light gray background
-                )
+                # Option to show/hide 2D timeline
+                show_2d = st.checkbox("Show 2D Timeline", value=True,
+                                 help="Enable/disable the 2D timeline to improve performance")
                 
-                # Make the chart more readable
-                fig2d.update_traces(
-                    marker_line_width=2,
-                    marker_line_color="white",
-                    opacity=0.8
-                )
+                gantt_rows = ()
                 
-                # Display the 2D timeline
-                st.plotly_chart(fig2d, use_container_width=True)
+                if not show_2d:
+                    st.info("2D timeline is disabled to improve performance. Check the box above to enable it.")
+                else:
+                    # Use simplified 2D timeline for better performance
+                    with st.spinner("Preparing 2D timeline..."):
+                        # Safely access threed_data with error handling
+                        try:
+                            # Limit number of tasks for performance
+                            max_tasks = 50
+                            show_tasks = len(threed_data) <= max_tasks or st.checkbox(
+                                "Show individual tasks", value=False,
+                                help="Plot a sample of the individual tasks instead of one bar per phase"
+                            )
+                            
+                            if not show_tasks:
+                                st.info(f"Showing one bar per phase for {len(threed_data)} tasks. Check the box above to see individual tasks.")
+                                # Collapse each phase into a single bar spanning its tasks;
+                                # the YYYY-MM-DD strings order like the dates they hold
+                                phase_spans = pd.DataFrame(threed_data, columns=['phase', 'start', 'end']).groupby(
+                                    'phase', sort=False
+                                ).agg(start=('start', 'min'), end=('end', 'max'))
+                                gantt_rows = tuple(
+                                    (phase, start, end, phase)
+                                    for phase, start, end in phase_spans.itertuples()
+                                )
+                            else:
+                                if len(threed_data) > max_tasks:
+                                    st.info(f"Showing {max_tasks} out of {len(threed_data)} tasks for better performance.")
+                                    # Sample tasks evenly across the dataset
+                                    indices = np.linspace(0, len(threed_data) - 1, max_tasks, dtype=int)
+                                    tasks_to_show = [threed_data[i] for i in indices]
+                                else:
+                                    tasks_to_show = threed_data
+                                
+                                # Only the columns the chart plots are needed; the figure is
+                                # cached on them
+                                gantt_rows = tuple(
+                                    (task['task'], task['start'], task['end'], task['phase'])
+                                    for task in tasks_to_show
+                                )
+                        except Exception as e:
+                            st.warning(f"Could not create 2D timeline: {e}")
+                            gantt_rows = ()
+                
+                if show_2d and gantt_rows:
+                    # Display the 2D timeline
+                    st.plotly_chart(build_timeline_gantt(gantt_rows, today), width="stretch")
+                
+            timeline_panel()
             
             # Add a completion meter
             st.subheader("Project Completion Meter")
             
-            # Calculate overall project completion
-            all_tasks = st.session_state.schedule
-            all_durations = [
-                (get_date(task['end_date']) - get_date(task['start_date'])).days 
-                for task in all_tasks
-            ]
-            total_duration_days = sum(all_durations)
-            
-            # Calculate weighted completion for each task
-            weighted_completions = []
-            for task in all_tasks:
-                start = get_date(task['start_date'])
-                end = get_date(task['end_date'])
-                duration = (end - start).days
-                
-                # Task weight based on duration proportion
-                task_weight = duration / total_duration_days if total_duration_days > 0 else 0
-                
-                # Use manual completion percentage if available
-                if hasattr(st.session_state, 'using_manual_completion') and st.session_state.using_manual_completion and 'manual_completion' in task:
-                    task_completion = task['manual_completion']
-                else:
-                    # Calculate completion based on dates
-                    if today < start:
-                        task_completion = 0
-                    elif today > end:
-                        task_completion = 100
-                    else:
-                        days_passed = (today - start).days
-                        task_completion = min(100, max(0, int((days_passed / duration) * 100))) if duration > 0 else 100
-                
-                weighted_completions.append(task_completion * task_weight)
-            
-            # Overall project completion
-            overall_completion = sum(weighted_completions)
-            
             # Create a more detailed progress visualization
             # First, create a colorful progress bar
             if overall_completion < 30:
@@ -1379,35 +2091,15 @@ with tab3:
             else:
                 bar_color = "rgba(0,128,0,0.8)"  # Green for late stages
                 
-            # Custom CSS for a more stylized progress bar
+            # Draw the progress bar with inline styles; only the fill width and
+            # color change between reruns, so no stylesheet is injected
             st.markdown(
                 f"""
-                <style>
-                    .completion-bar {{
-                        width: 100%;
-                        background-color: #f0f0f0;
-                        border-radius: 10px;
-                        margin-bottom: 20px;
-                        height: 30px;
-                        overflow: hidden;
-                        box-shadow: inset 0 1px 3px rgba(0,0,0,0.2);
-                    }}
-                    .completion-fill {{
-                        height: 100%;
-                        width: {overall_completion}%;
-                        background-color: {bar_color};
-                        border-radius: 10px;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        color: white;
-                        font-weight: bold;
-                        text-shadow: 1px 1px 1px rgba(0,0,0,0.3);
-                        transition: width 0.5s ease-in-out;
-                    }}
-                </style>
-                <div class="completion-bar">
-                    <div class="completion-fill">{overall_completion:.1f}%</div>
+                <div style="width:100%; background-color:#f0f0f0; border-radius:10px; margin-bottom:20px;
+                            height:30px; overflow:hidden; box-shadow:inset 0 1px 3px rgba(0,0,0,0.2);">
+                    <div style="height:100%; width:{overall_completion}%; background-color:{bar_color};
+                                border-radius:10px; display:flex; align-items:center; justify-content:center;
+                                color:white; font-weight:bold; text-shadow:1px 1px 1px rgba(0,0,0,0.3);">{overall_completion:.1f}%</div>
                 </div>
                 """,
                 unsafe_allow_html=True
@@ -1428,196 +2120,27 @@ with tab3:
                 )
             
             with completion_col2:
-                # Add remaining project stats in a modern card layout
-                # First normalize date objects for proper comparison
-                normalized_tasks = []
-                for task in all_tasks:
-                    task_copy = task.copy()
-                    if isinstance(task_copy['start_date'], str):
-                        task_copy['start_date'] = datetime.strptime(task_copy['start_date'], '%Y-%m-%d').date()
-                    elif isinstance(task_copy['start_date'], datetime):
-                        task_copy['start_date'] = task_copy['start_date'].date()
-                    
-                    if isinstance(task_copy['end_date'], str):
-                        task_copy['end_date'] = datetime.strptime(task_copy['end_date'], '%Y-%m-%d').date()
-                    elif isinstance(task_copy['end_date'], datetime):
-                        task_copy['end_date'] = task_copy['end_date'].date()
-                    
-                    normalized_tasks.append(task_copy)
-                
-                # Calculate remaining days using normalized dates
+                # Add remaining project stats in a modern card layout, using the
+                # start and end dates normalized once above
                 # Get the latest end date (project completion)
-                final_end_date = max(task['end_date'] for task in normalized_tasks)
+                final_end_date = max(all_end_dates)
                 
                 # Calculate remaining days until project completion
-                # Ensure both dates are proper date objects for comparison
-                if isinstance(final_end_date, datetime):
-                    final_end_date = final_end_date.date()
-                if isinstance(today, datetime):
-                    today = today.date()
-                
-                # Ensure both are date objects
-                if isinstance(final_end_date, date) and isinstance(today, date):
+                if isinstance(final_end_date, date):
                     remaining_days = (final_end_date - today).days if final_end_date > today else 0
                 else:
                     # Handle error case
                     st.error(f"Date conversion issue - final_end_date: {type(final_end_date)}, today: {type(today)}")
                     remaining_days = 0
                 
-                # Remove debug info and add a phase completion chart instead
-                # Calculate phase completion percentages
-                phase_completion_data = []
-                phases = sorted(list(set(task['phase'] for task in normalized_tasks)))
-                
-                # Debug information to help diagnose
-                st.write(f"Number of tasks found: {len(normalized_tasks)}")
-                st.write(f"Today's date for calculations: {today}")
-                
-                for phase in phases:
-                    phase_tasks = [task for task in normalized_tasks if task['phase'] == phase]
-                    
-                    # Calculate completion by weighted task completions
-                    total_phase_duration = sum((task['end_date'] - task['start_date']).days for task in phase_tasks)
-                    
-                    if total_phase_duration <= 0:
-                        phase_completion = 100  # Avoid division by zero
-                    else:
-                        weighted_sum = 0
-                        for task in phase_tasks:
-                            task_duration = (task['end_date'] - task['start_date']).days
-                            weight = task_duration / total_phase_duration if total_phase_duration > 0 else 0
-                            
-                            # Use manual completion if available
-                            if hasattr(st.session_state, 'using_manual_completion') and st.session_state.using_manual_completion and 'manual_completion' in task:
-                                task_completion = task['manual_completion']
-                            else:
-                                # Calculate completion based on dates
-                                if today < task['start_date']:
-                                    task_completion = 0
-                                elif today > task['end_date']:
-                                    task_completion = 100
-                                else:
-                                    task_days = max(1, (task['end_date'] - task['start_date']).days)
-                                    days_passed = (today - task['start_date']).days
-                                    task_completion = min(100, max(0, int((days_passed / task_days) * 100)))
-                            
-                            weighted_sum += task_completion * weight
-                        
-                        phase_completion = round(weighted_sum, 1)
-                    
-                    phase_completion_data.append({
-                        'Phase': phase,
-                        'Completion': phase_completion
-                    })
-                
-                # Create a DataFrame for the phase completion chart
-                phase_completion_df = pd.DataFrame(phase_completion_data)
-                
                 # Create a completion percentage by phase chart
-                fig = px.bar(
-                    phase_completion_df,
-                    x='Phase',
-                    y='Completion',
-                    title='Completion Percentage by Construction Phase',
-                    text='Completion',
-                    color='Completion',
-                    color_continuous_scale=[(0, "red"), (0.5, "yellow"), (1, "green")],
-                    range_color=[0, 100]
-                )
-                
-                fig.update_traces(
-                    texttemplate='%{text:.1f}%',
-                    textposition='outside',
-                    marker_line_width=1.5,
-                    marker_line_color='white'
-                )
-                
-                fig.update_layout(
-                    yaxis_range=[0, 105],  # Set y-axis range from 0 to 105 to make room for labels
-                    yaxis_title='Completion Percentage',
-                    xaxis_title='Construction Phase',
-                    coloraxis_showscale=False,
-                    font=dict(family="Arial", size=12),
-                    height=300,
-                    margin=dict(l=20, r=20, t=40, b=20)
-                )
-                
-                # Display the chart
-                st.plotly_chart(fig, use_container_width=True)
+                fig = build_phase_progress_bar(phase_completion_df)
                 
-                # Now calculate task counts using normalized dates
-                # Make sure we're comparing date objects of the same type
-                today_date = today
-                if isinstance(today, datetime):
-                    today_date = today.date()
+                # Display the chart as a static image-like plot; it is only a summary
+                st.plotly_chart(fig, width="stretch", config=STATIC_CHART_CONFIG)
                 
-                # Display task counts with debug information
-                st.write(f"Calculating task counts based on today ({today_date})")
-                
-                # Count tasks based on manual completion percentages
-                completed_tasks = 0
-                in_progress_with_completion = 0
-
-                # Check if we're using manual completion mode
-                if hasattr(st.session_state, 'using_manual_completion') and st.session_state.using_manual_completion:
-                    # Count tasks that are marked as 100% complete
-                    for task in normalized_tasks:
-                        task_id = task.get('id', task.get('task_name', ''))
-                        if 'manual_completion' in task and task['manual_completion'] == 100:
-                            completed_tasks += 1
-                        elif 'manual_completion' in task and task['manual_completion'] > 0:
-                            in_progress_with_completion += 1
-                else:
-                    # Traditional date-based counting
-                    for task in normalized_tasks:
-                        end_date = task['end_date']
-                        if isinstance(end_date, datetime):
-                            end_date = end_date.date()
-                        if end_date < today_date:
-                            completed_tasks += 1
-                
-                # Count in-progress tasks
-                in_progress_tasks = 0
-                
-                # If using manual completion, count tasks with partial completion percentages
-                if hasattr(st.session_state, 'using_manual_completion') and st.session_state.using_manual_completion:
-                    # Use the previously calculated in_progress_with_completion
-                    in_progress_tasks = in_progress_with_completion
-                    
-                    # Also count tasks with no completion value yet as in-progress
-                    # Get total task count
-                    total_tasks = len(normalized_tasks)
-                    not_started = total_tasks - completed_tasks - in_progress_with_completion
-                    future_tasks = not_started  # will be updated later
-                else:
-                    # Traditional date-based counting - today is between start and end dates
-                    for task in normalized_tasks:
-                        start_date = task['start_date']
-                        end_date = task['end_date']
-                        if isinstance(start_date, datetime):
-                            start_date = start_date.date()
-                        if isinstance(end_date, datetime):
-                            end_date = end_date.date()
-                        if start_date <= today_date <= end_date:
-                            in_progress_tasks += 1
-                
-                # Count future tasks
-                if hasattr(st.session_state, 'using_manual_completion') and st.session_state.using_manual_completion:
-                    # In manual mode, we already calculated future_tasks as tasks with 0% completion
-                    # The value was set in the in-progress tasks section
-                    pass  # Don't recalculate, use the value from before
-                else:
-                    # Traditional date-based counting - start date is after today
-                    future_tasks = 0
-                    for task in normalized_tasks:
-                        start_date = task['start_date']
-                        if isinstance(start_date, datetime):
-                            start_date = start_date.date()
-                        if start_date > today_date:
-                            future_tasks += 1
-                
-                # Show counts summary for verification
-                st.write(f"Task counts: {completed_tasks} completed, {in_progress_tasks} in progress, {future_tasks} upcoming")
+                # Completed, in progress and upcoming tasks, counted in the summary
+                completed_tasks, in_progress_tasks, future_tasks = task_counts
                 
                 st.markdown(
                     f"""
@@ -1651,13 +2174,13 @@ with tab3:
         # Calculate metrics based on the filtered schedule view
         if filtered_schedule:
             # Use the currently selected date range for metrics
-            filtered_earliest_start = min(get_date(task['start_date']) for task in filtered_schedule)
-            filtered_latest_end = max(get_date(task['end_date']) for task in filtered_schedule)
+            filtered_earliest_start = task_starts[task_mask].min().item()
+            filtered_latest_end = task_ends[task_mask].max().item()
             filtered_duration = (filtered_latest_end - filtered_earliest_start).days
             
             # Get the overall project dates for comparison
-            overall_earliest_start = min(get_date(task['start_date']) for task in st.session_state.schedule)
-            overall_latest_end = max(get_date(task['end_date']) for task in st.session_state.schedule)
+            overall_earliest_start = min(all_start_dates)
+            overall_latest_end = max(all_end_dates)
             overall_duration = (overall_latest_end - overall_earliest_start).days
             
             # Display filtered view metrics
@@ -1689,8 +2212,8 @@ with tab3:
             overall_col3.metric("Total Project Duration", f"{overall_duration} days")
         else:
             # Fallback if filtered schedule is empty
-            earliest_start = min(get_date(task['start_date']) for task in st.session_state.schedule)
-            latest_end = max(get_date(task['end_date']) for task in st.session_state.schedule)
+            earliest_start = min(all_start_dates)
+            latest_end = max(all_end_dates)
             project_duration = (latest_end - earliest_start).days
             
             col1, col2, col3 = st.columns(3)
@@ -1700,173 +2223,30 @@ with tab3:
         
         # Display task distribution by phase
         st.subheader("Tasks by Construction Phase")
-        phase_counts = {}
-        for task in st.session_state.schedule:
-            if task['phase'] not in phase_counts:
-                phase_counts[task['phase']] = 0
-            phase_counts[task['phase']] += 1
-        
-        phase_df = pd.DataFrame({
-            'Phase': list(phase_counts.keys()),
-            'Number of Tasks': list(phase_counts.values())
-        })
-        
-        # Simplified tasks by phase bar chart
-        fig = px.bar(
-            phase_df, 
-            x='Phase', 
-            y='Number of Tasks', 
-            title='Tasks Distribution by Construction Phase',
-            text='Number of Tasks',
-            color_discrete_sequence=['#636efa']  # Single blue color
-        )
-        
-        fig.update_layout(
-            xaxis_title="Construction Phase",
-            yaxis_title="Number of Tasks",
-            font=dict(family="Arial", size=14),
-            hoverlabel=dict(
-                bgcolor="white",
-                font_size=14,
-                font_family="Arial"
-            )
-        )
+        fig = build_phase_count_bar(phase_df)
         
-        # Add value labels on top of bars
-        fig.update_traces(
-            texttemplate='%{text}',
-            textposition='outside',
-            marker_line_color='rgb(8,48,107)',
-            marker_line_width=1.5
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, width="stretch", config=STATIC_CHART_CONFIG)
         
         # Add a new visualization - Project Timeline Bar Chart
         st.subheader("Project Timeline Progress")
         
-        # Create a timeline summary by phase
-        timeline_data = []
-        phases = sorted(list(set(task['phase'] for task in st.session_state.schedule)))
-        
-        for phase in phases:
-            phase_tasks = [task for task in st.session_state.schedule if task['phase'] == phase]
-            earliest_start = min(get_date(task['start_date']) for task in phase_tasks)
-            latest_end = max(get_date(task['end_date']) for task in phase_tasks)
-            duration = (latest_end - earliest_start).days
-            
-            # Calculate completion percentage based on task completions
-            # If we have manual completion values, use weighted average of those tasks
-            if hasattr(st.session_state, 'using_manual_completion') and st.session_state.using_manual_completion:
-                # Calculate weighted completion for phase based on manual task completions
-                total_phase_duration = sum((get_date(task['end_date']) - get_date(task['start_date'])).days for task in phase_tasks)
-                
-                if total_phase_duration <= 0:
-                    completion = 100  # Avoid division by zero
-                else:
-                    weighted_sum = 0
-                    for task in phase_tasks:
-                        task_duration = (get_date(task['end_date']) - get_date(task['start_date'])).days
-                        weight = task_duration / total_phase_duration
-                        if 'manual_completion' in task:
-                            weighted_sum += task['manual_completion'] * weight
-                        else:
-                            # If a task doesn't have manual completion, calculate it
-                            today = datetime.now().date()
-                            start = get_date(task['start_date'])
-                            end = get_date(task['end_date'])
-                            if today < start:
-                                task_completion = 0
-                            elif today > end:
-                                task_completion = 100
-                            else:
-                                task_days = (end - start).days
-                                if task_days <= 0:
-                                    task_completion = 100
-                                else:
-                                    days_passed = (today - start).days
-                                    task_completion = min(100, max(0, int((days_passed / task_days) * 100)))
-                            weighted_sum += task_completion * weight
-                    
-                    completion = int(weighted_sum)
-            else:
-                # Traditional calculation based on today's date
-                today = datetime.now().date()
-                if today < earliest_start:
-                    completion = 0
-                elif today > latest_end:
-                    completion = 100
-                else:
-                    days_passed = (today - earliest_start).days
-                    completion = min(100, max(0, int((days_passed / duration) * 100)))
-            
-            timeline_data.append({
-                'Phase': phase,
-                'Start Date': earliest_start,
-                'End Date': latest_end,
-                'Duration (days)': duration,
-                'Completion': completion
-            })
-        
-        timeline_df = pd.DataFrame(timeline_data)
-        
         # Create a horizontal bar chart showing phase durations with completion indicators
-        # Simplified project timeline progress chart
-        fig = px.bar(
-            timeline_df, 
-            y='Phase', 
-            x='Duration (days)', 
-            color_discrete_sequence=['#5388D8'],  # Single uniform color
-            labels={'Duration (days)': 'Duration (days)', 'Phase': 'Construction Phase'},
-            title='Construction Phases Timeline',
-            text='Completion',  # Keep completion as text inside bars
-            hover_data=['Start Date', 'End Date', 'Duration (days)']
-        )
-        
-        fig.update_layout(
-            height=500,
-            yaxis={'categoryorder':'array', 'categoryarray': list(reversed(phases))},
-            font=dict(family="Arial", size=14),
-            hoverlabel=dict(
-                bgcolor="white",
-                font_size=14,
-                font_family="Arial"
-            ),
-            # Add a vertical line for today's date
-            shapes=[dict(
-                type='line',
-                x0=0,
-                x1=max(timeline_df['Duration (days)']),
-                y0=-0.5,
-                y1=len(timeline_df) - 0.5,
-                yref='y',
-                line=dict(color='rgba(0,0,0,0.3)', width=2, dash='dot')
-            )]
-        )
-        
-        # Add value labels showing completion percentage
-        fig.update_traces(
-            texttemplate='%{text}%',
-            textposition='inside',
-            insidetextanchor='middle',
-            marker_line_color='rgb(8,48,107)',
-            marker_line_width=1.5
-        )
+        fig = build_phase_timeline_bar(timeline_df)
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, width="stretch")
         
         # Display critical path
         st.subheader("Critical Path")
         critical_tasks = [task for task in st.session_state.schedule if task.get('critical_path', False)]
         if critical_tasks:
             critical_df = pd.DataFrame(critical_tasks)
-            st.dataframe(critical_df, use_container_width=True)
+            st.dataframe(critical_df, width="stretch")
             
             # Create a timeline for critical path
             fig = px.timeline(critical_df, x_start='start_date', x_end='end_date', y='task_name',
                              title='Critical Path Timeline')
             fig.update_yaxes(autorange="reversed")
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, width="stretch")
         else:
             st.info("No critical path identified for this project.")
 
@@ -1877,6 +2257,12 @@ with tab4:
     if st.session_state.materials is None or st.session_state.schedule is None:
         st.info("Please upload and process a blueprint first.")
     else:
+        # Stamp the exports once per session so file names and the report date
+        # stay the same across reruns
+        if 'export_date' not in st.session_state:
+            st.session_state.export_date = datetime.now()
+        export_date = st.session_state.export_date
+        
         # Add settings for currency and unit conversion for exports
         st.subheader("Export Settings")
         
@@ -1884,148 +2270,53 @@ with tab4:
         
         # Currency selection
         with settings_col1:
-            # Currency conversion rates (USD to other currencies)
-            currency_rates = {
-                "USD": 1.0,
-                "INR": 83.5,  # Indian Rupee
-                "EUR": 0.92,  # Euro
-                "GBP": 0.79,  # British Pound
-                "JPY": 151.2, # Japanese Yen
-                "CNY": 7.22,  # Chinese Yuan
-                "AUD": 1.50,  # Australian Dollar
-                "CAD": 1.36,  # Canadian Dollar
-            }
-            
-            currency_symbols = {
-                "USD": "$",
-                "INR": "₹",
-                "EUR": "€",
-                "GBP": "£",
-                "JPY": "¥",
-                "CNY": "¥",
-                "AUD": "A$",
-                "CAD": "C$",
-            }
-            
             export_currency = st.selectbox(
                 "Select Currency for Export:", 
-                options=list(currency_rates.keys()),
-                format_func=lambda x: f"{x} ({currency_symbols[x]})",
+                options=list(CURRENCY_RATES.keys()),
+                format_func=lambda x: f"{x} ({CURRENCY_SYMBOLS[x]})",
                 index=1,  # Default to INR
                 key="export_currency"
             )
             
-            # Store the conversion rate
-            export_rate = currency_rates[export_currency]
-            export_symbol = currency_symbols[export_currency]
+            # Store the currency symbol for the conversion note
+            export_symbol = CURRENCY_SYMBOLS[export_currency]
             
         # Unit conversion selection
         with settings_col2:
-            # Unit conversion options and rates
-            unit_conversions = {
-                "No Conversion": {
-                    "cubic yards": (1.0, "cubic yards"),
-                    "sq ft": (1.0, "sq ft"),
-                    "linear feet": (1.0, "linear feet"),
-                    "pieces": (1.0, "pieces"),
-                    "tons": (1.0, "tons"),
-                    "gallons": (1.0, "gallons")
-                },
-                "Metric": {
-                    "cubic yards": (0.764555, "cubic meters"),
-                    "sq ft": (0.092903, "sq meters"),
-                    "linear feet": (0.3048, "meters"),
-                    "pieces": (1.0, "pieces"),
-                    "tons": (0.907185, "tonnes"),
-                    "gallons": (3.78541, "liters")
-                },
-                "Imperial (UK)": {
-                    "cubic yards": (0.764555, "cubic yards"),
-                    "sq ft": (0.092903, "sq feet"),
-                    "linear feet": (0.3048, "feet"),
-                    "pieces": (1.0, "pieces"),
-                    "tons": (1.0, "tons"),
-                    "gallons": (0.832674, "imp. gallons")
-                }
-            }
-            
             export_units = st.selectbox(
                 "Select Unit System for Export:",
-                options=list(unit_conversions.keys()),
+                options=list(UNIT_CONVERSIONS.keys()),
                 index=1,  # Default to Metric
                 key="export_units"
             )
             
-            # Store the unit conversion dictionary
-            export_converters = unit_conversions[export_units]
-        
-        # Function to convert material values based on settings
-        def convert_export_material(item):
-            # Copy the original item
-            converted = item.copy()
-            
-            # Apply currency conversion to cost
-            if 'cost' in item:
-                converted['cost'] = item['cost'] * export_rate
-            
-            # Apply currency conversion to cost_per_unit if it exists
-            if 'cost_per_unit' in item:
-                converted['cost_per_unit'] = item['cost_per_unit'] * export_rate
-            else:
-                # Calculate cost per unit if not present
-                if 'cost' in item and 'quantity' in item and item['quantity'] > 0:
-                    converted['cost_per_unit'] = item['cost'] / item['quantity']
-                else:
-                    converted['cost_per_unit'] = 0
-            
-            # Apply unit conversion if needed
-            if 'unit' in item:
-                original_unit = item['unit']
-                if original_unit in export_converters:
-                    factor, new_unit = export_converters[original_unit]
-                    if 'quantity' in item:
-                        converted['quantity'] = item['quantity'] * factor
-                    converted['unit'] = new_unit
-                    # Adjust cost per unit based on the new unit
-                    if 'cost_per_unit' in converted and factor > 0:
-                        converted['cost_per_unit'] = converted['cost_per_unit'] / factor
-            
-            # Format cost values for display
-            if 'cost' in converted:
-                converted['display_cost'] = f"{export_symbol}{converted['cost']:,.2f}"
-            if 'cost_per_unit' in converted:
-                converted['display_cost_per_unit'] = f"{export_symbol}{converted['cost_per_unit']:,.2f}"
-            
-            return converted
-            
-        # Convert all materials based on selected currency and units
-        export_materials = [convert_export_material(item) for item in st.session_state.materials]
+        # Build the summary and export tables once per distinct materials,
+        # schedule, project information and settings; the files themselves are
+        # only written when their download button is clicked
+        summary, export_sheets = build_export_files(
+            st.session_state.materials,
+            st.session_state.schedule,
+            ProjectInfo.from_dict(st.session_state.project_info),
+            export_currency,
+            export_units,
+            export_date
+        )
         
         # Add a note about conversions
         st.info(f"💡 All exports will use {export_currency} ({export_symbol}) currency and {export_units} measurement system.")
         
         st.subheader("Export Options")
         
-        # Generate CSV data for materials with conversions applied
-        materials_csv = io.StringIO()
-        materials_df = pd.DataFrame(export_materials)
-        materials_df.to_csv(materials_csv, index=False)
-        
-        # Generate CSV data for schedule
-        schedule_csv = io.StringIO()
-        schedule_df = pd.DataFrame(st.session_state.schedule)
-        schedule_df.to_csv(schedule_csv, index=False)
-        
         col1, col2 = st.columns(2)
         
         # Get current date for filenames
-        current_date = datetime.now().strftime("%Y%m%d")
+        current_date = export_date.strftime("%Y%m%d")
         project_slug = st.session_state.project_info['name'].lower().replace(" ", "_")
         
         with col1:
             st.download_button(
                 label="Download Material Estimation (CSV)",
-                data=materials_csv.getvalue(),
+                data=lambda: csv_bytes(export_sheets["Materials"]),
                 file_name=f"{project_slug}_materials_{export_currency}_{export_units.lower().replace(' ', '_')}_{current_date}.csv",
                 mime="text/csv"
             )
@@ -2033,77 +2324,13 @@ with tab4:
         with col2:
             st.download_button(
                 label="Download Construction Schedule (CSV)",
-                data=schedule_csv.getvalue(),
+                data=lambda: csv_bytes(export_sheets["Schedule"]),
                 file_name=f"{project_slug}_schedule_{current_date}.csv",
                 mime="text/csv"
             )
             
         st.subheader("Project Summary Report")
         
-        # Helper function to format dates for summary
-        def format_date(date_obj):
-            if hasattr(date_obj, 'date'):
-                return date_obj.date().strftime("%Y-%m-%d")
-            return date_obj.strftime("%Y-%m-%d")
-        
-        # Calculate start and end dates using the get_date helper for consistent date objects
-        start_dates = [get_date(task['start_date']) for task in st.session_state.schedule]
-        end_dates = [get_date(task['end_date']) for task in st.session_state.schedule]
-        
-        # Find earliest start and latest end
-        earliest_start = min(start_dates)
-        latest_end = max(end_dates)
-        
-        # Calculate duration
-        project_duration = (latest_end - earliest_start).days
-        
-        # Calculate total cost in selected currency
-        total_cost = sum(item.get('cost', 0) for item in export_materials)
-        
-        # Convert area to selected unit system if needed
-        area_value = st.session_state.project_info['area_sqft']
-        area_unit = "sq ft"
-        
-        if export_units == "Metric":
-            area_value = area_value * 0.092903
-            area_unit = "sq meters"
-        elif export_units == "Imperial (UK)":
-            area_unit = "sq feet"
-            
-        # Generate project summary with converted values
-        summary = f"""
-        # Project Summary Report
-        
-        ## Project Information
-        - **Project Name:** {st.session_state.project_info['name']}
-        - **Location:** {st.session_state.project_info['location']}
-        - **Start Date:** {st.session_state.project_info['start_date']}
-        - **Contractor:** {st.session_state.project_info['contractor']}
-        - **Total Area:** {area_value:,.2f} {area_unit}
-        
-        ## Material Estimation Summary
-        - **Total Material Cost:** {export_symbol}{total_cost:,.2f}
-        - **Number of Material Types:** {len(st.session_state.materials)}
-        - **Currency:** {export_currency}
-        - **Unit System:** {export_units}
-        
-        ## Schedule Summary
-        - **Project Start Date:** {format_date(earliest_start)}
-        - **Project End Date:** {format_date(latest_end)}
-        - **Project Duration:** {project_duration} days
-        - **Number of Tasks:** {len(st.session_state.schedule)}
-        
-        ## Top 5 Most Expensive Materials
-        """
-        
-        # Add top materials with converted values
-        sorted_materials = sorted(export_materials, key=lambda x: x.get('cost', 0), reverse=True)[:5]
-        for i, material in enumerate(sorted_materials, 1):
-            cost = material.get('cost', 0)
-            quantity = material.get('quantity', 0)
-            unit = material.get('unit', '')
-            summary += f"{i}. **{material['name']}**: {export_symbol}{cost:,.2f} ({quantity:,.2f} {unit})\n"
-        
         st.markdown(summary)
         
         # Download summary report
@@ -2113,32 +2340,11 @@ with tab4:
             file_name=f"{project_slug}_summary_{export_currency}_{current_date}.md",
             mime="text/markdown"
         )
-        
-        # Create Excel export with multiple sheets
-        excel_buffer = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer) as writer:
-            materials_df.to_excel(writer, sheet_name="Materials", index=False)
-            schedule_df.to_excel(writer, sheet_name="Schedule", index=False)
-            
-            # Add project info as a separate sheet
-            project_info_df = pd.DataFrame([{
-                "Project Name": st.session_state.project_info['name'],
-                "Location": st.session_state.project_info['location'],
-                "Start Date": st.session_state.project_info['start_date'],
-                "Contractor": st.session_state.project_info['contractor'],
-                "Area": f"{area_value:,.2f} {area_unit}",
-                "Total Cost": f"{export_symbol}{total_cost:,.2f}",
-                "Currency": export_currency,
-                "Units": export_units,
-                "Project Duration": f"{project_duration} days",
-                "Generated On": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }])
-            project_info_df.to_excel(writer, sheet_name="Project Info", index=False)
             
         # Offer Excel download
         st.download_button(
             label="Download Complete Project Report (Excel)",
-            data=excel_buffer.getvalue(),
+            data=lambda: write_excel_report(export_sheets),
             file_name=f"{project_slug}_complete_report_{export_currency}_{export_units.lower().replace(' ', '_')}_{current_date}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
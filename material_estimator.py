@@ -1,4 +1,4 @@
-import numpy as np
+import math
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -11,7 +11,8 @@ def estimate_materials(analysis_result, project_info):
         project_info: Dictionary with project information
     
     Returns:
-        List of dictionaries containing material estimates
+        DataFrame with one row per material estimate (name, quantity, unit,
+        cost and category)
     """
     # Get relevant information from analysis result
     building_area_ratio = analysis_result.get('building_area_ratio', 0.5)
@@ -34,6 +35,11 @@ def estimate_materials(analysis_result, project_info):
     # Calculate building area (adjusted by the area ratio from analysis)
     building_area = area_sqft * building_area_ratio
     
+    # Side and perimeter of a square footprint with that area, shared by the
+    # wall, roof and door estimates
+    side = math.sqrt(building_area)
+    perimeter = 4 * side
+    
     # Initialize materials list
     materials = []
     
@@ -80,7 +86,7 @@ def estimate_materials(analysis_result, project_info):
     
     # Masonry (bricks/blocks)
     # Assuming 10-foot walls and 7.5 blocks per square foot
-    wall_area = np.sqrt(building_area) * 4 * 10  # perimeter * height
+    wall_area = perimeter * 10  # perimeter * height
     blocks_needed = wall_area * 0.75  # 0.75 blocks per sq ft for 8-inch blocks
     materials.append({
         'name': 'Concrete Blocks (8-inch)',
@@ -112,7 +118,7 @@ def estimate_materials(analysis_result, project_info):
     })
     
     # Roof trusses (~1 truss per 2 linear feet of building width)
-    building_width = np.sqrt(building_area)
+    building_width = side
     roof_trusses = building_width / 2
     materials.append({
         'name': 'Roof Trusses',
@@ -134,7 +140,7 @@ def estimate_materials(analysis_result, project_info):
     
     # Drywall (4'x8' sheets, ~32 sq ft per sheet)
     # Assuming wall height of 8 feet, plus ceiling
-    wall_area = (np.sqrt(building_area) * 4 * 8) + building_area  # perimeter * height + ceiling
+    wall_area = (perimeter * 8) + building_area  # perimeter * height + ceiling
     drywall_sheets = wall_area / 32
     materials.append({
         'name': 'Drywall Sheets',
@@ -178,7 +184,7 @@ def estimate_materials(analysis_result, project_info):
     # Doors (based on building size and rooms with reasonable limits)
     # Typically one door per room plus 1-2 exterior doors
     interior_doors = num_rooms  # 1 door per room
-    exterior_doors = min(max(int(np.sqrt(building_area) / 15), 1), 4)  # 1-4 exterior doors based on perimeter
+    exterior_doors = min(max(int(side / 15), 1), 4)  # 1-4 exterior doors based on perimeter
     
     # Total doors with a reasonable maximum
     door_count = min(interior_doors + exterior_doors, 30)  # Cap at 30 doors for very large buildings
@@ -233,5 +239,5 @@ def estimate_materials(analysis_result, project_info):
         'category': 'Other'
     })
     
-    # Return materials list
-    return materials
+    # Return the estimates as a table; every consumer works on columns
+    return pd.DataFrame(materials)
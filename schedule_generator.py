@@ -1,7 +1,184 @@
-from datetime import datetime, timedelta
+import math
+from datetime import datetime
 import pandas as pd
 import numpy as np
 
+# Construction tasks in schedule order; task IDs are the 1-based positions.
+# Each record is (task name, phase, responsible party, description, resources
+# needed, predecessor task IDs, duration spec, start spec). Whether a task is
+# on the critical path follows from the durations and start specs. Task ID
+# groups are tuples so the shared table cannot be modified through a row.
+#
+# A duration spec is (kind, divisor or days, use complexity, minimum days,
+# maximum days), where kind is:
+#   'sqrt'          - square root of the area divided by the divisor
+#   'area'          - area divided by the divisor
+#   'rooms'         - number of rooms divided by the divisor
+#   'windows_doors' - number of windows and doors divided by the divisor
+#   'fixed'         - always the given number of days
+#
+# A start spec is ('after', task IDs) to start the day after the latest of
+# those tasks ends, ('with', task ID) to start alongside that task, or None
+# to start on the project start date.
+TASKS = (
+    # Phase 1: Site Preparation and Foundation
+    ('Site Clearing and Preparation', 'Site Preparation', 'General Contractor',
+     'Clear site, remove obstacles, grade land',
+     'Excavator, Dump Truck, Labor Crew', (),
+     ('sqrt', 50, False, 1, 30), None),
+    ('Excavation', 'Foundation', 'Excavation Crew',
+     'Excavate foundation area and utility trenches',
+     'Excavator, Dump Truck, Labor Crew', (1,),
+     ('sqrt', 50, True, 1, 30), ('after', (1,))),
+    ('Foundation Formwork', 'Foundation', 'Concrete Contractor',
+     'Build forms for concrete foundation',
+     'Lumber, Form Hardware, Labor Crew', (2,),
+     ('sqrt', 30, True, 2, 30), ('after', (2,))),
+    ('Steel Reinforcement Installation', 'Foundation', 'Concrete Contractor',
+     'Install rebar for foundation',
+     'Rebar, Tie Wire, Labor Crew', (3,),
+     ('sqrt', 70, True, 1, 30), ('after', (3,))),
+    ('Foundation Concrete Pour', 'Foundation', 'Concrete Contractor',
+     'Pour concrete for foundation',
+     'Concrete, Pump Truck, Labor Crew', (4,),
+     ('sqrt', 100, True, 1, 30), ('after', (4,))),
+    # Standard curing time for concrete, counted from the start of the pour
+    ('Foundation Curing', 'Foundation', 'Concrete Contractor',
+     'Allow concrete to cure properly',
+     'Water, Concrete Curing Blankets', (5,),
+     ('fixed', 7, False, 7, 7), ('with', 5)),
+    
+    # Phase 2: Framing
+    ('Floor Framing', 'Framing', 'Framing Contractor',
+     'Frame floor structure',
+     'Lumber, Nail Gun, Labor Crew', (6,),
+     ('area', 500, True, 2, 30), ('after', (6,))),
+    ('Wall Framing', 'Framing', 'Framing Contractor',
+     'Frame exterior and interior walls',
+     'Lumber, Nail Gun, Labor Crew', (7,),
+     ('area', 400, True, 3, 30), ('after', (7,))),
+    ('Roof Framing', 'Framing', 'Framing Contractor',
+     'Install roof trusses and framing',
+     'Trusses, Lumber, Nail Gun, Labor Crew', (8,),
+     ('area', 500, True, 2, 30), ('after', (8,))),
+    ('Roofing Installation', 'Exterior', 'Roofing Contractor',
+     'Install roof sheathing, underlayment, and shingles',
+     'Shingles, Underlayment, Nail Gun, Labor Crew', (9,),
+     ('area', 600, True, 2, 30), ('after', (9,))),
+    
+    # Phase 3: Rough-Ins; the rough-ins run concurrently with the window
+    # installation
+    ('Window and Exterior Door Installation', 'Exterior', 'Carpentry Crew',
+     'Install windows and exterior doors',
+     'Windows, Doors, Flashing, Labor Crew', (10,),
+     ('windows_doors', 4, True, 1, 30), ('after', (10,))),
+    ('Plumbing Rough-in', 'Rough-ins', 'Plumbing Contractor',
+     'Install rough plumbing',
+     'Pipes, Fittings, Tools, Labor Crew', (9,),
+     ('rooms', 2, True, 3, 30), ('with', 11)),
+    ('Electrical Rough-in', 'Rough-ins', 'Electrical Contractor',
+     'Install rough electrical wiring',
+     'Wiring, Boxes, Panels, Labor Crew', (9,),
+     ('area', 500, True, 3, 30), ('with', 11)),
+    ('HVAC Rough-in', 'Rough-ins', 'HVAC Contractor',
+     'Install HVAC ductwork and units',
+     'Ductwork, HVAC Units, Tools, Labor Crew', (9,),
+     ('area', 700, True, 2, 30), ('with', 11)),
+    ('Insulation Installation', 'Rough-ins', 'Insulation Contractor',
+     'Install insulation in walls and ceiling',
+     'Insulation, Staple Gun, Labor Crew', (12, 13, 14),
+     ('area', 1000, True, 1, 30), ('after', (11, 12, 13, 14))),
+    
+    # Phase 4: Interior Finishing
+    ('Drywall Installation', 'Interior Finishing', 'Drywall Contractor',
+     'Install and finish drywall',
+     'Drywall Sheets, Joint Compound, Tools, Labor Crew', (15,),
+     ('area', 400, True, 3, 30), ('after', (15,))),
+    ('Interior Door Installation', 'Interior Finishing', 'Carpentry Crew',
+     'Install interior doors and trim',
+     'Doors, Trim, Nail Gun, Labor Crew', (16,),
+     ('rooms', 2, True, 1, 20), ('after', (16,))),
+    ('Painting', 'Interior Finishing', 'Painting Contractor',
+     'Prime and paint walls and ceilings',
+     'Paint, Brushes, Rollers, Labor Crew', (17,),
+     ('area', 500, True, 3, 30), ('after', (17,))),
+    ('Flooring Installation', 'Interior Finishing', 'Flooring Contractor',
+     'Install flooring throughout the building',
+     'Flooring Materials, Tools, Labor Crew', (18,),
+     ('area', 500, True, 2, 30), ('after', (18,))),
+    ('Cabinetry and Countertop Installation', 'Interior Finishing', 'Cabinet Installer',
+     'Install kitchen and bathroom cabinets and countertops',
+     'Cabinets, Countertops, Tools, Labor Crew', (19,),
+     ('rooms', 3, True, 2, 15), ('after', (19,))),
+    
+    # Phase 5: Final Finishing; finishing work only uses the size factor
+    ('Plumbing Fixtures Installation', 'Final Finishing', 'Plumbing Contractor',
+     'Install sinks, toilets, faucets, and other plumbing fixtures',
+     'Fixtures, Tools, Labor Crew', (20,),
+     ('rooms', 3, False, 1, 10), ('after', (20,))),
+    ('Electrical Fixtures Installation', 'Final Finishing', 'Electrical Contractor',
+     'Install light fixtures, outlets, switches, and electrical panels',
+     'Fixtures, Tools, Labor Crew', (20,),
+     ('area', 1000, False, 1, 30), ('with', 21)),
+    ('Appliance Installation', 'Final Finishing', 'General Contractor',
+     'Install kitchen and laundry appliances',
+     'Appliances, Tools, Labor Crew', (21, 22),
+     ('fixed', 1, False, 1, 1), ('after', (21, 22))),
+    ('Final Cleaning', 'Final Finishing', 'Cleaning Crew',
+     'Clean entire building interior and exterior',
+     'Cleaning Supplies, Labor Crew', (23,),
+     ('area', 2000, False, 1, 30), ('after', (23,))),
+    ('Final Inspection', 'Final Finishing', 'Building Inspector',
+     'Final inspection and certificate of occupancy',
+     'Inspector', (24,),
+     ('fixed', 1, False, 1, 1), ('after', (24,))),
+)
+
+# The duration specs as aligned arrays so every task duration is computed in
+# one vectorized pass; kinds are coded by their position in DURATION_KINDS
+DURATION_KINDS = ('sqrt', 'area', 'rooms', 'windows_doors', 'fixed')
+TASK_DURATION_KINDS = np.array([DURATION_KINDS.index(task[6][0]) for task in TASKS])
+TASK_DIVISORS = np.array([task[6][1] for task in TASKS], dtype=np.float64)
+TASK_USES_COMPLEXITY = np.array([task[6][2] for task in TASKS])
+TASK_MINIMUM_DAYS = np.array([task[6][3] for task in TASKS], dtype=np.float64)
+TASK_MAXIMUM_DAYS = np.array([task[6][4] for task in TASKS], dtype=np.float64)
+TASK_AREA_BASED = TASK_DURATION_KINDS <= DURATION_KINDS.index('area')
+TASK_FIXED = TASK_DURATION_KINDS == DURATION_KINDS.index('fixed')
+
+# Prebuilt schedule rows holding each task's static fields; generate_schedule
+# copies them and fills in the dates and duration
+TASK_TEMPLATES = tuple(
+    {
+        'task_id': task_id,
+        'task_name': task_name,
+        'phase': phase,
+        'start_date': None,
+        'end_date': None,
+        'duration': None,
+        'responsible_party': responsible_party,
+        'description': description,
+        'critical_path': None,
+        'resources_needed': resources_needed,
+        'predecessor_tasks': predecessor_tasks,
+        'manual_completion_pct': None  # Field for manual completion percentage
+    }
+    for task_id, (task_name, phase, responsible_party, description,
+                  resources_needed, predecessor_tasks, _, _) in enumerate(TASKS, 1)
+)
+
+# The tasks each task starts the day after. A task that starts alongside
+# another waits on that task's own predecessors, so 'with' specs resolve to
+# the other task's entry, and tasks starting on the project start date get ()
+TASK_START_AFTER = []
+for start_spec in (task[7] for task in TASKS):
+    if start_spec is None:
+        TASK_START_AFTER.append(())
+    elif start_spec[0] == 'with':
+        TASK_START_AFTER.append(TASK_START_AFTER[start_spec[1] - 1])
+    else:
+        TASK_START_AFTER.append(start_spec[1])
+TASK_START_AFTER = tuple(TASK_START_AFTER)
+
 def generate_schedule(analysis_result, project_info):
     """
     Generate a day-by-day construction schedule based on blueprint analysis 
@@ -14,9 +191,6 @@ def generate_schedule(analysis_result, project_info):
     Returns:
         List of dictionaries containing schedule tasks
     """
-    # Memoization cache for expensive calculations
-    calculation_cache = {}
-    
     # Get project information
     start_date = project_info.get('start_date', datetime.now().date())
     area_sqft = project_info.get('area_sqft', 1000)
@@ -54,588 +228,88 @@ def generate_schedule(analysis_result, project_info):
     complexity_factor = min(complexity_factor, MAX_COMPLEXITY)
     
     # Calculate project size factor (larger projects take longer per sq ft)
-    size_factor = 1.0
-    if area_sqft < 1000:
-        size_factor = 0.8
-    elif area_sqft > 3000:
-        size_factor = 1.2
-    
-    # Set a reasonable maximum size factor
-    MAX_SIZE_FACTOR = 1.5
-    size_factor = min(size_factor, MAX_SIZE_FACTOR)
-    
-    # Helper function to calculate task duration with caching
-    def calculate_duration(base_factor, divisor, use_complexity=True, minimum_days=1, maximum_days=30):
-        """Calculate task duration with memoization to avoid redundant calculations"""
-        cache_key = f"{base_factor}_{divisor}_{use_complexity}_{minimum_days}"
-        if cache_key in calculation_cache:
-            return calculation_cache[cache_key]
-        
-        if base_factor == 'sqrt':
-            result = max(minimum_days, int(np.sqrt(area_sqft) / divisor))
+    size_factor = 0.8 if area_sqft < 1000 else 1.2 if area_sqft > 3000 else 1.0
+    
+    # Calculate every task duration at once. Each task's quantity (area,
+    # its square root, rooms or windows and doors) is divided into whole days
+    # and floored at the minimum. Area-based durations are truncated after each
+    # factor, count-based ones once after both; all are capped at the maximum.
+    quantities = np.array([math.sqrt(area_sqft), area_sqft, num_rooms, num_windows_doors, 0.0])
+    base_days = np.maximum(TASK_MINIMUM_DAYS, np.trunc(quantities[TASK_DURATION_KINDS] / TASK_DIVISORS))
+    task_complexity = np.where(TASK_USES_COMPLEXITY, complexity_factor, 1.0)
+    area_days = np.trunc(np.trunc(base_days * task_complexity) * size_factor)
+    count_days = np.trunc(base_days * task_complexity * size_factor)
+    durations = np.minimum(np.where(TASK_AREA_BASED, area_days, count_days), TASK_MAXIMUM_DAYS)
+    durations = np.where(TASK_FIXED, TASK_DIVISORS, durations).astype(np.int64).tolist()
+    
+    # Lay out the tasks as whole-day offsets from the project start: each task
+    # starts on the project start date or the day after the latest of the
+    # tasks it waits on ends
+    start_offsets = []
+    end_offsets = []
+    for duration, start_after in zip(durations, TASK_START_AFTER):
+        if start_after:
+            offset = max(end_offsets[i - 1] for i in start_after) + 1
         else:
-            result = max(minimum_days, int(area_sqft / divisor))
-            
-        if use_complexity:
-            result = int(result * complexity_factor)
-            
-        result = int(result * size_factor)
-        
-        # Cap the maximum duration of any single task
-        result = min(result, maximum_days)
-        
-        # Cache the result
-        calculation_cache[cache_key] = result
-        return result
-    
-    # Initialize schedule
-    schedule = []
-    current_date = start_date
-    
-    # Phase 1: Site Preparation and Foundation
-    
-    # Task 1: Site clearing and preparation
-    site_prep_days = calculate_duration('sqrt', 50, use_complexity=False, minimum_days=1)
-    end_date = current_date + timedelta(days=site_prep_days)
-    schedule.append({
-        'task_id': 1,
-        'task_name': 'Site Clearing and Preparation',
-        'phase': 'Site Preparation',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': site_prep_days,
-        'responsible_party': 'General Contractor',
-        'description': 'Clear site, remove obstacles, grade land',
-        'critical_path': True,
-        'resources_needed': 'Excavator, Dump Truck, Labor Crew',
-        'predecessor_tasks': [],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 2: Excavation
-    excavation_days = calculate_duration('sqrt', 50, use_complexity=True, minimum_days=1)
-    end_date = current_date + timedelta(days=excavation_days)
-    schedule.append({
-        'task_id': 2,
-        'task_name': 'Excavation',
-        'phase': 'Foundation',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': excavation_days,
-        'responsible_party': 'Excavation Crew',
-        'description': 'Excavate foundation area and utility trenches',
-        'critical_path': True,
-        'resources_needed': 'Excavator, Dump Truck, Labor Crew',
-        'predecessor_tasks': [1],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 3: Foundation formwork
-    formwork_days = calculate_duration('sqrt', 30, use_complexity=True, minimum_days=2)
-    end_date = current_date + timedelta(days=formwork_days)
-    schedule.append({
-        'task_id': 3,
-        'task_name': 'Foundation Formwork',
-        'phase': 'Foundation',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': formwork_days,
-        'responsible_party': 'Concrete Contractor',
-        'description': 'Build forms for concrete foundation',
-        'critical_path': True,
-        'resources_needed': 'Lumber, Form Hardware, Labor Crew',
-        'predecessor_tasks': [2],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 4: Steel reinforcement installation
-    rebar_days = calculate_duration('sqrt', 70, use_complexity=True, minimum_days=1)
-    end_date = current_date + timedelta(days=rebar_days)
-    schedule.append({
-        'task_id': 4,
-        'task_name': 'Steel Reinforcement Installation',
-        'phase': 'Foundation',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': rebar_days,
-        'responsible_party': 'Concrete Contractor',
-        'description': 'Install rebar for foundation',
-        'critical_path': True,
-        'resources_needed': 'Rebar, Tie Wire, Labor Crew',
-        'predecessor_tasks': [3],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 5: Foundation concrete pour
-    concrete_days = calculate_duration('sqrt', 100, use_complexity=True, minimum_days=1)
-    end_date = current_date + timedelta(days=concrete_days)
-    schedule.append({
-        'task_id': 5,
-        'task_name': 'Foundation Concrete Pour',
-        'phase': 'Foundation',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': concrete_days,
-        'responsible_party': 'Concrete Contractor',
-        'description': 'Pour concrete for foundation',
-        'critical_path': True,
-        'resources_needed': 'Concrete, Pump Truck, Labor Crew',
-        'predecessor_tasks': [4],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Task 6: Foundation curing
-    curing_days = 7  # Standard curing time for concrete
-    curing_start = current_date
-    curing_end = curing_start + timedelta(days=curing_days)
-    schedule.append({
-        'task_id': 6,
-        'task_name': 'Foundation Curing',
-        'phase': 'Foundation',
-        'start_date': curing_start,
-        'end_date': curing_end,
-        'duration': curing_days,
-        'responsible_party': 'Concrete Contractor',
-        'description': 'Allow concrete to cure properly',
-        'critical_path': True,
-        'resources_needed': 'Water, Concrete Curing Blankets',
-        'predecessor_tasks': [5],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = curing_end + timedelta(days=1)
-    
-    # Phase 2: Framing
-    
-    # Task 7: Floor framing
-    floor_days = calculate_duration('normal', 500, use_complexity=True, minimum_days=2)
-    end_date = current_date + timedelta(days=floor_days)
-    schedule.append({
-        'task_id': 7,
-        'task_name': 'Floor Framing',
-        'phase': 'Framing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': floor_days,
-        'responsible_party': 'Framing Contractor',
-        'description': 'Frame floor structure',
-        'critical_path': True,
-        'resources_needed': 'Lumber, Nail Gun, Labor Crew',
-        'predecessor_tasks': [6],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 8: Wall framing
-    wall_days = calculate_duration('normal', 400, use_complexity=True, minimum_days=3)
-    end_date = current_date + timedelta(days=wall_days)
-    schedule.append({
-        'task_id': 8,
-        'task_name': 'Wall Framing',
-        'phase': 'Framing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': wall_days,
-        'responsible_party': 'Framing Contractor',
-        'description': 'Frame exterior and interior walls',
-        'critical_path': True,
-        'resources_needed': 'Lumber, Nail Gun, Labor Crew',
-        'predecessor_tasks': [7],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 9: Roof framing
-    roof_days = calculate_duration('normal', 500, use_complexity=True, minimum_days=2)
-    end_date = current_date + timedelta(days=roof_days)
-    schedule.append({
-        'task_id': 9,
-        'task_name': 'Roof Framing',
-        'phase': 'Framing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': roof_days,
-        'responsible_party': 'Framing Contractor',
-        'description': 'Install roof trusses and framing',
-        'critical_path': True,
-        'resources_needed': 'Trusses, Lumber, Nail Gun, Labor Crew',
-        'predecessor_tasks': [8],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 10: Roofing
-    roofing_days = calculate_duration('normal', 600, use_complexity=True, minimum_days=2)
-    end_date = current_date + timedelta(days=roofing_days)
-    schedule.append({
-        'task_id': 10,
-        'task_name': 'Roofing Installation',
-        'phase': 'Exterior',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': roofing_days,
-        'responsible_party': 'Roofing Contractor',
-        'description': 'Install roof sheathing, underlayment, and shingles',
-        'critical_path': True,
-        'resources_needed': 'Shingles, Underlayment, Nail Gun, Labor Crew',
-        'predecessor_tasks': [9],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Phase 3: Rough-Ins
-    
-    # Task 11: Window and exterior door installation
-    # Using the num_windows_doors for calculation with a custom approach
-    window_days = max(1, int(num_windows_doors / 4))
-    window_days = int(window_days * complexity_factor * size_factor)
-    # Apply the maximum days limit
-    window_days = min(window_days, 30)
-    end_date = current_date + timedelta(days=window_days)
-    schedule.append({
-        'task_id': 11,
-        'task_name': 'Window and Exterior Door Installation',
-        'phase': 'Exterior',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': window_days,
-        'responsible_party': 'Carpentry Crew',
-        'description': 'Install windows and exterior doors',
-        'critical_path': False,
-        'resources_needed': 'Windows, Doors, Flashing, Labor Crew',
-        'predecessor_tasks': [10],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Task 12: Plumbing rough-in (happens concurrently with window installation)
-    # Using num_rooms with a custom approach for plumbing calculation
-    plumbing_days = max(3, (num_rooms // 2))
-    plumbing_days = int(plumbing_days * complexity_factor * size_factor)
-    # Apply the maximum days limit
-    plumbing_days = min(plumbing_days, 30)
-    plumbing_start = current_date
-    plumbing_end = plumbing_start + timedelta(days=plumbing_days)
-    schedule.append({
-        'task_id': 12,
-        'task_name': 'Plumbing Rough-in',
-        'phase': 'Rough-ins',
-        'start_date': plumbing_start,
-        'end_date': plumbing_end,
-        'duration': plumbing_days,
-        'responsible_party': 'Plumbing Contractor',
-        'description': 'Install rough plumbing',
-        'critical_path': True,
-        'resources_needed': 'Pipes, Fittings, Tools, Labor Crew',
-        'predecessor_tasks': [9],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Task 13: Electrical rough-in (happens concurrently with window installation)
-    electrical_days = calculate_duration('normal', 500, use_complexity=True, minimum_days=3)
-    electrical_start = current_date
-    electrical_end = electrical_start + timedelta(days=electrical_days)
-    schedule.append({
-        'task_id': 13,
-        'task_name': 'Electrical Rough-in',
-        'phase': 'Rough-ins',
-        'start_date': electrical_start,
-        'end_date': electrical_end,
-        'duration': electrical_days,
-        'responsible_party': 'Electrical Contractor',
-        'description': 'Install rough electrical wiring',
-        'critical_path': True,
-        'resources_needed': 'Wiring, Boxes, Panels, Labor Crew',
-        'predecessor_tasks': [9],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Task 14: HVAC rough-in (happens concurrently with window installation)
-    hvac_days = calculate_duration('normal', 700, use_complexity=True, minimum_days=2)
-    hvac_start = current_date
-    hvac_end = hvac_start + timedelta(days=hvac_days)
-    schedule.append({
-        'task_id': 14,
-        'task_name': 'HVAC Rough-in',
-        'phase': 'Rough-ins',
-        'start_date': hvac_start,
-        'end_date': hvac_end,
-        'duration': hvac_days,
-        'responsible_party': 'HVAC Contractor',
-        'description': 'Install HVAC ductwork and units',
-        'critical_path': False,
-        'resources_needed': 'Ductwork, HVAC Units, Tools, Labor Crew',
-        'predecessor_tasks': [9],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Determine the latest end date among concurrent tasks
-    current_date = max(plumbing_end, electrical_end, hvac_end, end_date) + timedelta(days=1)
-    
-    # Task 15: Insulation installation
-    insulation_days = calculate_duration('normal', 1000, use_complexity=True, minimum_days=1)
-    end_date = current_date + timedelta(days=insulation_days)
-    schedule.append({
-        'task_id': 15,
-        'task_name': 'Insulation Installation',
-        'phase': 'Rough-ins',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': insulation_days,
-        'responsible_party': 'Insulation Contractor',
-        'description': 'Install insulation in walls and ceiling',
-        'critical_path': True,
-        'resources_needed': 'Insulation, Staple Gun, Labor Crew',
-        'predecessor_tasks': [12, 13, 14],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Phase 4: Interior Finishing
-    
-    # Task 16: Drywall installation
-    drywall_days = calculate_duration('normal', 400, use_complexity=True, minimum_days=3)
-    end_date = current_date + timedelta(days=drywall_days)
-    schedule.append({
-        'task_id': 16,
-        'task_name': 'Drywall Installation',
-        'phase': 'Interior Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': drywall_days,
-        'responsible_party': 'Drywall Contractor',
-        'description': 'Install and finish drywall',
-        'critical_path': True,
-        'resources_needed': 'Drywall Sheets, Joint Compound, Tools, Labor Crew',
-        'predecessor_tasks': [15],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 17: Interior door installation
-    # Using num_rooms with a custom approach for door calculation
-    door_days = max(1, (num_rooms // 2))
-    door_days = int(door_days * complexity_factor * size_factor)
-    # Apply the maximum days limit
-    door_days = min(door_days, 20)
-    end_date = current_date + timedelta(days=door_days)
-    schedule.append({
-        'task_id': 17,
-        'task_name': 'Interior Door Installation',
-        'phase': 'Interior Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': door_days,
-        'responsible_party': 'Carpentry Crew',
-        'description': 'Install interior doors and trim',
-        'critical_path': False,
-        'resources_needed': 'Doors, Trim, Nail Gun, Labor Crew',
-        'predecessor_tasks': [16],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Task 18: Painting (happens after doors are installed)
-    painting_days = calculate_duration('normal', 500, use_complexity=True, minimum_days=3)
-    painting_start = end_date + timedelta(days=1)
-    painting_end = painting_start + timedelta(days=painting_days)
-    schedule.append({
-        'task_id': 18,
-        'task_name': 'Painting',
-        'phase': 'Interior Finishing',
-        'start_date': painting_start,
-        'end_date': painting_end,
-        'duration': painting_days,
-        'responsible_party': 'Painting Contractor',
-        'description': 'Prime and paint walls and ceilings',
-        'critical_path': True,
-        'resources_needed': 'Paint, Brushes, Rollers, Labor Crew',
-        'predecessor_tasks': [17],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = painting_end + timedelta(days=1)
-    
-    # Task 19: Flooring installation
-    flooring_days = calculate_duration('normal', 500, use_complexity=True, minimum_days=2)
-    end_date = current_date + timedelta(days=flooring_days)
-    schedule.append({
-        'task_id': 19,
-        'task_name': 'Flooring Installation',
-        'phase': 'Interior Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': flooring_days,
-        'responsible_party': 'Flooring Contractor',
-        'description': 'Install flooring throughout the building',
-        'critical_path': True,
-        'resources_needed': 'Flooring Materials, Tools, Labor Crew',
-        'predecessor_tasks': [18],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 20: Cabinetry and countertop installation
-    # Using num_rooms for cabinet calculation
-    cabinet_days = max(2, (num_rooms // 3))
-    cabinet_days = int(cabinet_days * complexity_factor * size_factor)
-    # Apply the maximum days limit
-    cabinet_days = min(cabinet_days, 15)
-    end_date = current_date + timedelta(days=cabinet_days)
-    schedule.append({
-        'task_id': 20,
-        'task_name': 'Cabinetry and Countertop Installation',
-        'phase': 'Interior Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': cabinet_days,
-        'responsible_party': 'Cabinet Installer',
-        'description': 'Install kitchen and bathroom cabinets and countertops',
-        'critical_path': True,
-        'resources_needed': 'Cabinets, Countertops, Tools, Labor Crew',
-        'predecessor_tasks': [19],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Phase 5: Final Finishing
-    
-    # Task 21: Plumbing fixtures installation
-    # Using num_rooms with a custom approach for plumbing fixtures
-    plumbing_fixture_days = max(1, (num_rooms // 3))
-    plumbing_fixture_days = int(plumbing_fixture_days * size_factor)  # Use only size factor for finishing work
-    # Apply the maximum days limit
-    plumbing_fixture_days = min(plumbing_fixture_days, 10)
-    end_date = current_date + timedelta(days=plumbing_fixture_days)
-    schedule.append({
-        'task_id': 21,
-        'task_name': 'Plumbing Fixtures Installation',
-        'phase': 'Final Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': plumbing_fixture_days,
-        'responsible_party': 'Plumbing Contractor',
-        'description': 'Install sinks, toilets, faucets, and other plumbing fixtures',
-        'critical_path': False,
-        'resources_needed': 'Fixtures, Tools, Labor Crew',
-        'predecessor_tasks': [20],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Task 22: Electrical fixtures installation (concurrent with plumbing fixtures)
-    # Use more efficient calculation for electrical fixtures
-    electrical_fixture_days = calculate_duration('normal', 1000, use_complexity=False, minimum_days=1)
-    electrical_fixture_start = current_date
-    electrical_fixture_end = electrical_fixture_start + timedelta(days=electrical_fixture_days)
-    schedule.append({
-        'task_id': 22,
-        'task_name': 'Electrical Fixtures Installation',
-        'phase': 'Final Finishing',
-        'start_date': electrical_fixture_start,
-        'end_date': electrical_fixture_end,
-        'duration': electrical_fixture_days,
-        'responsible_party': 'Electrical Contractor',
-        'description': 'Install light fixtures, outlets, switches, and electrical panels',
-        'critical_path': False,
-        'resources_needed': 'Fixtures, Tools, Labor Crew',
-        'predecessor_tasks': [20],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    
-    # Determine the latest end date among concurrent tasks
-    current_date = max(end_date, electrical_fixture_end) + timedelta(days=1)
-    
-    # Task 23: Appliance installation - fixed duration task
-    appliance_days = 1  # Simple fixed duration
-    end_date = current_date + timedelta(days=appliance_days)
-    schedule.append({
-        'task_id': 23,
-        'task_name': 'Appliance Installation',
-        'phase': 'Final Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': appliance_days,
-        'responsible_party': 'General Contractor',
-        'description': 'Install kitchen and laundry appliances',
-        'critical_path': True,
-        'resources_needed': 'Appliances, Tools, Labor Crew',
-        'predecessor_tasks': [21, 22],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 24: Final cleaning
-    # Simpler calculation for cleaning
-    cleaning_days = calculate_duration('normal', 2000, use_complexity=False, minimum_days=1)
-    end_date = current_date + timedelta(days=cleaning_days)
-    schedule.append({
-        'task_id': 24,
-        'task_name': 'Final Cleaning',
-        'phase': 'Final Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': cleaning_days,
-        'responsible_party': 'Cleaning Crew',
-        'description': 'Clean entire building interior and exterior',
-        'critical_path': True,
-        'resources_needed': 'Cleaning Supplies, Labor Crew',
-        'predecessor_tasks': [23],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
-    current_date = end_date + timedelta(days=1)
-    
-    # Task 25: Final inspection - fixed duration task
-    inspection_days = 1  # Simple fixed duration
-    end_date = current_date + timedelta(days=inspection_days)
-    schedule.append({
-        'task_id': 25,
-        'task_name': 'Final Inspection',
-        'phase': 'Final Finishing',
-        'start_date': current_date,
-        'end_date': end_date,
-        'duration': inspection_days,
-        'responsible_party': 'Building Inspector',
-        'description': 'Final inspection and certificate of occupancy',
-        'critical_path': True,
-        'resources_needed': 'Inspector',
-        'predecessor_tasks': [24],
-        'manual_completion_pct': None  # Field for manual completion percentage
-    })
+            offset = 0
+        start_offsets.append(offset)
+        end_offsets.append(offset + duration)
+    
+    # Mark the critical path: the tasks without slack. A backward pass from
+    # the project end gives the latest day each task can end without delaying
+    # the tasks that wait on it. Concurrent tasks constrain only their shared
+    # predecessors, so just the longest of them ends up without slack. Tasks
+    # only wait on earlier tasks, so one pass in reverse table order is enough.
+    latest_ends = [max(end_offsets)] * len(TASKS)
+    for i in range(len(TASKS) - 1, -1, -1):
+        latest_start = latest_ends[i] - durations[i]
+        for task_id in TASK_START_AFTER[i]:
+            latest_ends[task_id - 1] = min(latest_ends[task_id - 1], latest_start - 1)
+    critical_path = [latest_end == end_offset for latest_end, end_offset in zip(latest_ends, end_offsets)]
+    
+    # Turn the offsets into dates in one pass, keeping the start time of day
+    project_start = np.datetime64(start_date, 'us')
+    task_starts = project_start + np.array(start_offsets, dtype='timedelta64[D]')
+    task_ends = project_start + np.array(end_offsets, dtype='timedelta64[D]')
+    
+    # Build the schedule from copies of the task templates
+    schedule = [template.copy() for template in TASK_TEMPLATES]
+    for task, task_start, task_end, duration, is_critical in zip(
+        schedule, task_starts.tolist(), task_ends.tolist(), durations, critical_path
+    ):
+        task['start_date'] = task_start
+        task['end_date'] = task_end
+        task['duration'] = duration
+        task['critical_path'] = is_critical
+        # Rows expose the predecessors as a list of their own, which is also
+        # how the schedule exports write them
+        task['predecessor_tasks'] = list(task['predecessor_tasks'])
     
     # Return the schedule
     # Add task dependencies and convert predecessor_tasks IDs to task names
+    names_by_id = {task['task_id']: task['task_name'] for task in schedule}
     for task in schedule:
         # Convert task IDs to task names for dependencies
-        dependencies = []
-        for pred_id in task.get('predecessor_tasks', []):
-            pred_task = next((t for t in schedule if t['task_id'] == pred_id), None)
-            if pred_task:
-                dependencies.append(pred_task['task_name'])
-        
-        # Add dependencies to the task
-        task['dependencies'] = dependencies
-        
-        # Add a completion percentage based on current date
-        today = datetime.now().date()
-        
-        # Convert datetime to date for comparison if needed
-        end_date = task['end_date'].date() if hasattr(task['end_date'], 'date') else task['end_date']
-        start_date = task['start_date'].date() if hasattr(task['start_date'], 'date') else task['start_date']
-        
-        if end_date < today:
-            # Task should be complete
-            task['completion_percentage'] = 100
-        elif start_date > today:
-            # Task hasn't started yet
-            task['completion_percentage'] = 0
-        else:
-            # Task is in progress
-            total_days = (end_date - start_date).days
-            days_passed = (today - start_date).days
-            if total_days > 0:
-                completion = int((days_passed / total_days) * 100)
-                task['completion_percentage'] = min(100, max(0, completion))
-            else:
-                task['completion_percentage'] = 50
+        task['dependencies'] = [
+            names_by_id[pred_id] for pred_id in task.get('predecessor_tasks', []) if pred_id in names_by_id
+        ]
+    
+    # Add a completion percentage based on current date for all tasks at once,
+    # comparing calendar days
+    today = np.datetime64(datetime.now().date(), 'D')
+    start_days = task_starts.astype('datetime64[D]')
+    end_days = task_ends.astype('datetime64[D]')
+    total_days = (end_days - start_days).astype(np.int64)
+    days_passed = (today - start_days).astype(np.int64)
+    
+    # Tasks in progress are complete in proportion to the days passed, or half
+    # done if they start and end on the same day
+    in_progress = np.divide(days_passed, total_days, out=np.zeros(len(schedule)), where=total_days > 0) * 100
+    in_progress = np.where(total_days > 0, np.clip(np.trunc(in_progress), 0, 100), 50)
+    
+    # Tasks that have ended are complete and tasks yet to start are at zero
+    completion = np.where(end_days < today, 100, np.where(start_days > today, 0, in_progress))
+    for task, completion_percentage in zip(schedule, completion.astype(np.int64).tolist()):
+        task['completion_percentage'] = completion_percentage
     
     return schedule